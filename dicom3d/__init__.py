@@ -4,11 +4,14 @@ Root **dicom3d** module implementing **Section**, **Series**, **Dataset** class
 
 __all__ = [
 	"Section",
+	"CurvedSection",
 	"Series",
 	"Dataset",
 	"Plane",
 	"Vector",
 	"Point",
+	"PointArray",
+	"VectorArray",
 	"LocalCoordinateSystem",
 	"degrees", 
 	"radians",
@@ -17,5 +20,6 @@ __all__ = [
 
 from .dataset import *
 from .section import *
+from .curved import *
 from .series import *
 from .geometry import *
\ No newline at end of file
@@ -0,0 +1,382 @@
+"""
+Memory bounded and persistent caches used by **dicom3d** objects
+"""
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+class LRUCache():
+	"""
+		Thread-safe least recently used cache, bounded by the total size in bytes
+		of the stored values rather than by their number
+
+		Args:
+			max_bytes (int): maximum total size of the stored values, in bytes
+
+		Examples:
+			>>> cache = LRUCache(max_bytes=1024 * 1024)
+			>>> cache.put("key", np.zeros(1000))
+			>>> cache.get("key").shape
+			(1000,)
+			>>> cache.hits, cache.misses
+			(1, 0)
+	"""
+
+	def __init__(self, max_bytes):
+		self.max_bytes = int(max_bytes)
+		self.bytes     = 0
+		self.hits      = 0
+		self.misses    = 0
+		self.evictions = 0
+
+		self._entries = OrderedDict()
+		self._lock    = threading.Lock()
+
+	@staticmethod
+	def sizeof(value):
+		""" size in bytes of a cached value """
+		return getattr(value, "nbytes", 0)
+
+	def get(self, key, default=None):
+		"""
+		Returns the value stored for a key and marks it as most recently used
+
+		Args:
+			key (hashable): key of the value
+			default (optional): value returned when the key is not cached
+
+		Returns:
+			object: the cached value or **default**
+		"""
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is None:
+				self.misses += 1
+				return default
+
+			self._entries.move_to_end(key)
+			self.hits += 1
+			return entry[0]
+
+	def put(self, key, value):
+		"""
+		Stores a value, evicting the least recently used values until the total size
+		fits within **max_bytes**. Values larger than **max_bytes** are not stored.
+
+		Args:
+			key (hashable): key of the value
+			value (object): value to store, usually a numpy array
+
+		Returns:
+			bool: **True** if the value was stored, **False** otherwise
+		"""
+		nbytes = self.sizeof(value)
+
+		with self._lock:
+			previous = self._entries.pop(key, None)
+			if previous is not None:
+				self.bytes -= previous[1]
+
+			if nbytes > self.max_bytes:
+				return False
+
+			while self._entries and self.bytes + nbytes > self.max_bytes:
+				_, (_, evicted_bytes) = self._entries.popitem(last=False)
+				self.bytes -= evicted_bytes
+				self.evictions += 1
+
+			self._entries[key] = (value, nbytes)
+			self.bytes += nbytes
+			return True
+
+	def clear(self):
+		"""
+		Removes all values and resets the counters
+		"""
+		with self._lock:
+			self._entries.clear()
+			self.bytes = self.hits = self.misses = self.evictions = 0
+
+	def stats(self):
+		"""
+		Returns the usage counters of the cache
+
+		Returns:
+			dict: entries, bytes, max_bytes, hits, misses and evictions counters
+		"""
+		with self._lock:
+			return {
+				"entries"  : len(self._entries),
+				"bytes"    : self.bytes,
+				"max_bytes": self.max_bytes,
+				"hits"     : self.hits,
+				"misses"   : self.misses,
+				"evictions": self.evictions
+			}
+
+	def __len__(self):
+		return len(self._entries)
+
+	def __contains__(self, key):
+		with self._lock:
+			return key in self._entries
+
+	def __repr__(self):
+		return "%s: %d entries, %d/%d bytes, %d hits, %d misses" % (
+			type(self).__name__, len(self._entries),
+			self.bytes, self.max_bytes, self.hits, self.misses)
+
+class RenderCache(LRUCache):
+	"""
+		Cache of section images, keyed by the section geometry and the sampling options.
+		Attach one to a series to have **Section.image** and **Section.batch** reuse
+		images of sections requested before.
+
+		Args:
+			max_bytes (int): maximum total size of the cached images, in bytes
+			precision (float, optional): quantization step, in millimeters, of the origin
+				and pixel spacing of sections, defaults to 1.e-4
+
+		Note:
+			The geometry is quantized so that sections built again from the same plane
+			and origin hit the cache despite floating point noise. Axis vectors are
+			quantized with the same step, relative to their unit length.
+
+		Examples:
+			>>> series.render_cache = RenderCache(max_bytes=256 * 1024 * 1024)
+			>>> image = section.image((512,512)) # rendered
+			>>> image = section.image((512,512)) # served from cache
+			>>> series.render_cache.hits
+			1
+	"""
+
+	def __init__(self, max_bytes, precision=1.e-4):
+		super().__init__(max_bytes)
+		self.precision = precision
+
+	def key(self, transform, shape, interpolation, dtype, rescale=False):
+		"""
+		Builds the cache key of a section image
+
+		Args:
+			transform (LocalCoordinateSystem): the section's coordinate system
+			shape (tuple): (lines, width) of the image in pixels
+			interpolation (str): sampling mode
+			dtype (numpy.dtype): image type
+			rescale (bool, optional): whether samples are rescaled to output units
+
+		Returns:
+			tuple: hashable key
+		"""
+		geometry = np.array([
+			*transform.origin,
+			*transform.x_vector.tuple(),
+			*transform.y_vector.tuple(),
+			*transform.scaling ], dtype=float)
+
+		quantized = np.rint(geometry / self.precision).astype(np.int64)
+
+		return (tuple(quantized.tolist()), tuple(shape), interpolation, np.dtype(dtype).str, bool(rescale))
+
+class VolumeStore():
+	"""
+		Persistent cache of series volumes, stored in a directory as **.npy** files 
+		along with the geometry of each volume. Stored volumes are opened as memory 
+		maps, so that opening is immediate and processes share the operating system
+		page cache instead of each holding a copy.
+
+		Args:
+			directory (str): directory holding the stored volumes, created if missing
+
+		Note:
+			Volumes are keyed by the *SeriesInstanceUID* and the name, size and 
+			modification time of every file of the series, so that changed files 
+			are never served from a stale volume. Saving a volume removes the volumes
+			stored before for the same series and source directory, see **prune**.
+			**Series.from_directory** uses a store when given a *cache_dir*.
+
+		Examples:
+			>>> series = Series.from_directory(path, cache_dir="~/.cache/dicom3d") # cold: decodes and stores
+			>>> series = Series.from_directory(path, cache_dir="~/.cache/dicom3d") # warm: maps the volume
+	"""
+
+	def __init__(self, directory):
+		self.directory = os.path.abspath(os.path.expanduser(directory))
+		os.makedirs(self.directory, exist_ok=True)
+
+	@staticmethod
+	def key(files, uid):
+		"""
+		Builds the key of the volume of a series
+
+		Args:
+			files (list): paths of the files of the series
+			uid (str): *SeriesInstanceUID* of the series
+
+		Returns:
+			str: hexadecimal key
+		"""
+		digest = hashlib.sha1(str(uid).encode())
+		for path in sorted(files):
+			stat = os.stat(path)
+			digest.update(("\0%s\0%d\0%d" % (
+				os.path.basename(path), stat.st_size, stat.st_mtime_ns)).encode())
+
+		return digest.hexdigest()
+
+	def _paths(self, key):
+		path = os.path.join(self.directory, key)
+		return path + ".npy", path + ".json"
+
+	def load(self, key, geometry=None):
+		"""
+		Opens a stored volume
+
+		Args:
+			key (str): key of the volume, see **key**
+			geometry (VolumeGeometry, optional): expected geometry of the volume
+
+		Returns:
+			numpy.memmap: read-only memory map of the volume, or **None** when the
+			volume is not stored or its geometry differs from **geometry**
+		"""
+		volume_path, meta_path = self._paths(key)
+		if not os.path.exists(meta_path):
+			return None
+
+		with open(meta_path) as meta_file:
+			meta = json.load(meta_file)
+
+		if geometry is not None and not self._matches(meta, geometry):
+			return None
+
+		try:
+			volume = np.load(volume_path, mmap_mode="r")
+		except (OSError, ValueError):
+			return None
+
+		if list(volume.shape) != meta["shape"] or volume.dtype.str != meta["dtype"]:
+			return None
+
+		return volume
+
+	def save(self, key, volume, geometry, uid=None, source=None):
+		"""
+		Stores a volume and its geometry. Files are written under temporary names and
+		renamed when complete, so concurrent readers never see partial volumes.
+
+		Args:
+			key (str): key of the volume, see **key**
+			volume (numpy.array): (slices, rows, columns) volume array
+			geometry (VolumeGeometry): geometry of the volume
+			uid (str, optional): *SeriesInstanceUID* of the series, when given the
+				volumes stored before for the same series and **source** are removed
+			source (str, optional): directory the series was read from
+		"""
+		volume_path, meta_path = self._paths(key)
+		suffix = ".%d.tmp" % (os.getpid())
+
+		with open(volume_path + suffix, "wb") as volume_file:
+			np.save(volume_file, np.ascontiguousarray(volume))
+
+		meta = {
+			"shape"   : list(volume.shape),
+			"dtype"   : volume.dtype.str,
+			"origins" : geometry.origins.tolist(),
+			"x_vector": geometry.x_vector.tolist(),
+			"y_vector": geometry.y_vector.tolist(),
+			"scaling" : list(geometry.scaling),
+			"mapping" : list(geometry.mapping),
+			"uid"     : None if uid is None else str(uid),
+			"source"  : None if source is None else os.path.abspath(source)
+		}
+
+		with open(meta_path + suffix, "w") as meta_file:
+			json.dump(meta, meta_file)
+
+		os.replace(volume_path + suffix, volume_path)
+		os.replace(meta_path + suffix, meta_path)
+
+		if uid is not None:
+			self.prune(uid, source, keep=key)
+
+	def prune(self, uid, source=None, keep=None):
+		"""
+		Removes the stored volumes of a series, such as volumes left stale by
+		changes to its files
+
+		Args:
+			uid (str): *SeriesInstanceUID* of the series
+			source (str, optional): only remove volumes read from this directory
+			keep (str, optional): key of a volume to keep
+
+		Returns:
+			int: number of removed volumes
+		"""
+		source  = None if source is None else os.path.abspath(source)
+		removed = 0
+
+		for name in os.listdir(self.directory):
+			key, extension = os.path.splitext(name)
+			# only volume metadata, not temporary files or header indexes kept alongside
+			if extension != ".json" or key == keep or "." in key or "-" in key:
+				continue
+
+			try:
+				with open(os.path.join(self.directory, name)) as meta_file:
+					meta = json.load(meta_file)
+			except (OSError, ValueError):
+				continue
+
+			if meta.get("uid") != str(uid) or (source is not None and meta.get("source") != source):
+				continue
+
+			if self.remove(key):
+				removed += 1
+
+		return removed
+
+	def remove(self, key):
+		"""
+		Removes a stored volume. Volumes already opened keep working where the
+		operating system allows removing mapped files.
+
+		Args:
+			key (str): key of the volume, see **key**
+
+		Returns:
+			bool: **True** if the volume was removed
+		"""
+		volume_path, meta_path = self._paths(key)
+		try:
+			# metadata first, so that the volume is no longer found
+			os.remove(meta_path)
+		except OSError:
+			return False
+
+		try:
+			os.remove(volume_path)
+		except OSError:
+			pass
+
+		return True
+
+	def __contains__(self, key):
+		return os.path.exists(self._paths(key)[1])
+
+	@staticmethod
+	def _matches(meta, geometry):
+		""" verifies stored metadata against the geometry of a series """
+		if tuple(meta["shape"]) != geometry.shape:
+			return False
+
+		return all(np.allclose(meta[name], value, atol=1.e-4) for name, value in (
+			("origins" , geometry.origins),
+			("x_vector", geometry.x_vector),
+			("y_vector", geometry.y_vector),
+			("scaling" , geometry.scaling),
+			("mapping" , geometry.mapping)))
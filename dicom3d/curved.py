@@ -0,0 +1,202 @@
+import numpy as np
+
+# internal
+from .geometry import *
+from .render import render_points, MEMORY_BUDGET
+
+class CurvedSection():
+
+	"""
+		This class manages a curved section of the volumetrical scan, following
+		a path such as a vessel or the spine. The section is the ruled surface swept
+		by a lateral direction along the path, and its image is the surface
+		stretched flat: columns follow the path, lines follow the lateral direction.
+
+		Args:
+			series (Series): a **dicom3d.Series** object
+			path (list): **Point** objects or tuples of world coordinates, in order
+			direction (Vector, tuple): lateral direction of the surface
+			pixel_spacing (tuple, optional): distance in millimeters between pixels along
+				the path and along the lateral direction, defaults to the series pixel spacing
+
+		Raises:
+			ValueError: when the path has no length or the direction is null
+
+		Examples:
+			To build a curved section along a path, looking from the front:
+				>>> path = [ Point(-10,20,-40), Point(-5,22,-10), Point(0,20,20) ]
+				>>> section = CurvedSection(series, path, Vector(1,0,0))
+
+			To get its image, 100 pixels wide around the path:
+				>>> section.image(100)
+
+			To use the local coordinate system:
+				>>> point = section.to_mm(x,y)
+				>>> x,y = section.to_pixel(point)
+	"""
+
+	def __init__(self, series, path, direction, pixel_spacing=None):
+		points = np.array([ tuple(point) for point in path ], dtype=float).reshape(-1, 3)
+
+		# drop repeated points, they add nothing to the path
+		if len(points) > 1:
+			keep = np.ones(len(points), dtype=bool)
+			keep[1:] = np.linalg.norm(np.diff(points, axis=0), axis=1) > 0
+			points = points[keep]
+
+		if len(points) < 2:
+			raise ValueError("curved section path needs at least two distinct points")
+
+		direction = np.array(tuple(direction), dtype=float)
+		norm = np.linalg.norm(direction)
+		if norm == 0:
+			raise ValueError("curved section direction is a null vector")
+
+		self.series    = series
+		self.path      = points
+		self.direction = direction / norm
+
+		# distance along the path of each path point
+		lengths  = np.linalg.norm(np.diff(points, axis=0), axis=1)
+		self.arc = np.concatenate(([0.0], np.cumsum(lengths)))
+
+		if pixel_spacing is None:
+			pixel_spacing = series.first().transform.scaling
+
+		self.pixel_spacing = (float(pixel_spacing[0]), float(pixel_spacing[1]))
+
+	def length(self):
+		"""
+		Returns:
+			float: length of the path in millimeters
+		"""
+		return float(self.arc[-1])
+
+	def width(self):
+		"""
+		Returns:
+			int: width in pixels of the section image, covering the whole path
+		"""
+		return int(self.length() / self.pixel_spacing[0]) + 1
+
+	def along(self, distance):
+		"""
+		Calculates points located at the given distances along the path
+
+		Args:
+			distance (float, numpy.array): distances in millimeters from the first path point
+
+		Returns:
+			numpy.array: (...,3) array of world coordinates
+		"""
+		distance = np.asarray(distance, dtype=float)
+		return np.stack([ np.interp(distance, self.arc, self.path[:,axis])
+							for axis in range(0, 3) ], axis=-1)
+
+	def to_mm(self, x, y):
+		"""
+		Converts the local pixel coordinates to world coordinates in millimeter units
+
+		Args:
+			x (int): value on the X axis, along the path
+			y (int): value on the Y axis, along the lateral direction
+
+		Returns:
+			Point: transformed three-dimensional point representing world coordinates
+		"""
+		dx, dy = self.pixel_spacing
+		point  = self.along(x * dx) + (y * dy) * self.direction
+		return Point(*point)
+
+	def to_pixel(self, coords):
+		"""
+		Converts the given point from world coordinates in millimeter units,
+		to local coordinates, in pixels, of the closest point of the surface
+
+		Args:
+			coords (tuple, Point): point describing world coordinates
+
+		Returns:
+			tuple: transformed two-dimensional point representing local coordinates
+		"""
+		point = np.array(tuple(coords), dtype=float)
+		dx, dy = self.pixel_spacing
+
+		# find the closest path position, disregarding the lateral direction
+		start = self._flatten(self.path[:-1])
+		delta = self._flatten(self.path[1:]) - start
+
+		span = np.einsum("ij,ij->i", delta, delta)
+		t = np.einsum("ij,ij->i", self._flatten(point) - start, delta)
+		t = np.clip(np.divide(t, span, out=np.zeros_like(t), where=span > 0), 0, 1)
+
+		distance = np.linalg.norm(start + t[:,None] * delta - self._flatten(point), axis=1)
+		segment  = np.argmin(distance)
+		position = self.arc[segment] + t[segment] * (self.arc[segment + 1] - self.arc[segment])
+
+		offset = np.dot(point - self.along(position), self.direction)
+		return (int(position / dx), int(offset / dy))
+
+	def _flatten(self, points):
+		""" removes the lateral component of world coordinates """
+		return points - np.dot(points, self.direction)[...,None] * self.direction
+
+	def grid(self, height):
+		"""
+		Calculates the world coordinates of every pixel of the section image
+
+		Args:
+			height (int): number of lines of the image, centered on the path
+
+		Returns:
+			numpy.array: (height, width, 3) array of world coordinates
+		"""
+		dx, dy = self.pixel_spacing
+		x = np.arange(0, self.width())
+		y = np.arange(0, height) - height//2
+
+		return self.along(x * dx)[None,:,:] + (y * dy)[:,None,None] * self.direction
+
+	def image(self, height, interpolation="nearest", memory_budget=MEMORY_BUDGET,
+			  dtype=None, rescale=False):
+		"""
+		Constructs the image of this curved section, with one column for each
+		pixel along the path
+
+		Args:
+			height (int, float): number of lines of the image, or its height in millimeters
+				when given as a float
+			interpolation (str, optional): sampling mode, "nearest", "trilinear" or "cubic".
+				Defaults to "nearest".
+			memory_budget (int, optional): bytes available for intermediate arrays
+			dtype (numpy.dtype, optional): image type, same as for **Section.image**
+			rescale (bool, optional): converts samples to output units, same as for **Section.image**
+
+		Raises:
+			ValueError: when input of unknown type is received
+
+		Returns:
+			numpy.array: numpy array of the constructed image
+
+		Examples:
+			>>> # 40 mm around the path
+			>>> image = section.image(40.0, interpolation="trilinear")
+			>>> image.shape == (int(40.0 / section.pixel_spacing[1]), section.width())
+			True
+		"""
+		if type(height) == float:
+			height = int(height / self.pixel_spacing[1])
+		elif type(height) != int:
+			raise ValueError(
+				"Unknown curved section height type (%s) need float or integer" % (type(height)))
+
+		geometry, volume, rescaling = self.series.sampling(self.pixel_spacing, rescale)
+
+		return render_points(
+			self.grid(height),
+			geometry,
+			volume,
+			dtype=dtype,
+			interpolation=interpolation,
+			memory_budget=memory_budget,
+			rescale=rescaling)
@@ -1,6 +1,8 @@
-from .getfiles import walk_data, select_file
+from .getfiles import walk_data, scan_data, is_dicom, select_file
 from .getfiles import get_testdata_dirs, get_testdata_files
+from .synthetic import synthetic_volume, synthetic_datasets
 
 __all__ = [
-	"walk_data", "select_file", "get_testdata_dirs", "get_testdata_files"
+	"walk_data", "scan_data", "is_dicom", "select_file", "get_testdata_dirs", "get_testdata_files",
+	"synthetic_volume", "synthetic_datasets"
 ]
\ No newline at end of file
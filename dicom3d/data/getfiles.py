@@ -1,38 +1,94 @@
-from os.path import abspath, join, dirname
-from os import walk
+from os.path import abspath, join, dirname, normcase
+from os import scandir
 import fnmatch
+import re
 
 # for future use
 # currently set to the current working directory
 DATA_ROOT = abspath('.')
 
-def walk_data(base, pattern, search_files=True, search_dirs=False):
-	""" Enuerates the files in data directory """
+DICOM_MAGIC = b"DICM"
+DICOM_PREAMBLE = 128
+
+def is_dicom(path):
+	"""
+	Checks if a file is a DICOM file, by the *DICM* magic following its 128 bytes preamble
+
+	Args:
+		path (str): path to the file
+
+	Returns:
+		bool: True if the file is a DICOM file, False otherwise
+	"""
+	try:
+		with open(path, "rb") as file:
+			header = file.read(DICOM_PREAMBLE + len(DICOM_MAGIC))
+	except OSError:
+		return False
 
+	return header[DICOM_PREAMBLE:] == DICOM_MAGIC
+
+def scan_data(base, pattern="*", search_files=True, search_dirs=False, dicom=False):
+	"""
+	Enumerates the files and directories under *base* matching a wildcard pattern,
+	yielding each match as soon as it is found
+
+	Args:
+		base (str): directory to start search from
+		pattern (str, optional): wildcard pattern matched anywhere in the paths (e.g. .dcm)
+		search_files (bool, optional): True to yield files
+		search_dirs (bool, optional): True to yield directories
+		dicom (bool, optional): True to only yield DICOM files, detected by their contents
+			rather than by their names (see **is_dicom**)
+
+	Note:
+		Paths are yielded in the same order as **walk_data** lists them: directories 
+		top-down, and in each directory the matching subdirectories before the 
+		matching files. Symbolic links to directories are not followed.
+
+	Examples:
+		>>> for path in scan_data("/archive", dicom=True):
+		>>>		print(path)
+	"""
 	# if the user forgot to add them
-	pattern = "*" + pattern + "*"
+	match = re.compile(fnmatch.translate(normcase("*" + pattern + "*"))).match
+
+	pending = [ base ]
+	while pending:
+		root = pending.pop()
 
-	files = []
-	for root, dirnames, filenames in walk(base):
+		try:
+			entries = list(scandir(root))
+		except OSError:
+			continue
+
+		directories, files = [], []
+		for entry in entries:
+			try:
+				is_dir = entry.is_dir()
+			except OSError:
+				is_dir = False
+			(directories if is_dir else files).append(entry)
 
-		# filter only directories
 		if search_dirs:
-			for directory in dirnames:
-				dirname_filter = fnmatch.filter([join(root, directory)],
-												 pattern)
-				if len(dirname_filter):
-					files.append(dirname_filter[0])
+			for entry in directories:
+				path = join(root, entry.name)
+				if match(normcase(path)):
+					yield path
 
-		# filter only files
 		if search_files:
+			for entry in files:
+				path = join(root, entry.name)
+				if match(normcase(path)) and (not dicom or is_dicom(path)):
+					yield path
 
-			for filename in filenames:
-				filename_filter = fnmatch.filter([join(root, filename)],
-												 pattern)
-				if len(filename_filter):
-					files.append(filename_filter[0])
+		# depth-first, in listing order
+		pending.extend(join(root, entry.name) for entry in reversed(directories)
+						if not entry.is_symlink())
 
-	return files
+def walk_data(base, pattern, search_files=True, search_dirs=False):
+	""" Enuerates the files in data directory, see **scan_data** """
+	return list(scan_data(base, pattern, search_files, search_dirs))
 
 def select_file(base_dir, pattern, 
 				search_files, search_dirs, 
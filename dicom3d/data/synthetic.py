@@ -0,0 +1,95 @@
+import numpy as np
+from pydicom.dataset import Dataset, FileMetaDataset
+from pydicom.uid import ExplicitVRLittleEndian, generate_uid
+
+CT_IMAGE_STORAGE = "1.2.840.10008.5.1.4.1.1.2"
+
+def synthetic_volume(count, rows, columns, seed=0):
+	"""
+	Generates a volume of pseudo-random CT values, useful for examples and benchmarks
+	that need a volumetric scan without having one on disk
+
+	Args:
+		count (int): number of slices
+		rows (int): number of rows of each slice
+		columns (int): number of columns of each slice
+		seed (int, optional): seed of the random generator, defaults to 0
+
+	Returns:
+		numpy.array: (count, rows, columns) array of **int16** values
+	"""
+	random = np.random.RandomState(seed)
+
+	# smooth blobs over noise, so that sections show some structure
+	zz, yy, xx = np.mgrid[0:count, 0:rows, 0:columns]
+	volume = 1000 * np.sin(xx / 7.0) * np.cos(yy / 11.0) * np.sin(zz / 5.0 + 1)
+	volume += random.randint(-50, 50, size=volume.shape)
+
+	return volume.astype(np.int16)
+
+def synthetic_datasets(count=64, rows=128, columns=128,
+					   pixel_spacing=(0.7, 0.7), thickness=2.5,
+					   position=(-100.0, -120.0, -50.0), seed=0):
+	"""
+	Generates a list of axial **pydicom.dataset.Dataset** objects forming a homogeneous
+	volumetric scan
+
+	Args:
+		count (int, optional): number of datasets, defaults to 64
+		rows (int, optional): number of rows of each dataset, defaults to 128
+		columns (int, optional): number of columns of each dataset, defaults to 128
+		pixel_spacing (tuple, optional): pixel spacing in millimeters, defaults to (0.7, 0.7)
+		thickness (float, optional): slice thickness in millimeters, defaults to 2.5
+		position (tuple, optional): position of the first dataset, defaults to (-100,-120,-50)
+		seed (int, optional): seed of the random generator, defaults to 0
+
+	Returns:
+		list: list of **pydicom.dataset.Dataset** objects, in acquisition order
+
+	Examples:
+		>>> datasets = synthetic_datasets(count=100)
+		>>> series = dicom3d.Series(datasets)
+		>>> series.count()
+		100
+	"""
+	volume = synthetic_volume(count, rows, columns, seed)
+	series_uid = generate_uid()
+	px, py, pz = position
+
+	datasets = []
+	for idx in range(0, count):
+		z = pz + idx * thickness
+
+		ds = Dataset()
+		ds.file_meta = FileMetaDataset()
+		ds.file_meta.TransferSyntaxUID = ExplicitVRLittleEndian
+		ds.file_meta.MediaStorageSOPClassUID = CT_IMAGE_STORAGE
+		ds.file_meta.MediaStorageSOPInstanceUID = generate_uid()
+
+		ds.SOPClassUID       = CT_IMAGE_STORAGE
+		ds.SOPInstanceUID    = ds.file_meta.MediaStorageSOPInstanceUID
+		ds.SeriesInstanceUID = series_uid
+		ds.Modality          = "CT"
+		ds.SeriesNumber      = 1
+		ds.InstanceNumber    = idx + 1
+
+		ds.ImageOrientationPatient = [1, 0, 0, 0, 1, 0]
+		ds.ImagePositionPatient    = [px, py, z]
+		ds.PixelSpacing            = list(pixel_spacing)
+		ds.SliceThickness          = thickness
+		ds.SliceLocation           = z
+
+		ds.Rows, ds.Columns        = rows, columns
+		ds.SamplesPerPixel         = 1
+		ds.PhotometricInterpretation = "MONOCHROME2"
+		ds.BitsAllocated           = 16
+		ds.BitsStored              = 16
+		ds.HighBit                 = 15
+		ds.PixelRepresentation     = 1
+		ds.RescaleSlope            = 1
+		ds.RescaleIntercept        = -1024
+		ds.PixelData               = volume[idx].tobytes()
+
+		datasets.append(ds)
+
+	return datasets
@@ -1,34 +1,57 @@
 import os
+import pydicom
+import numpy as np
 
 # internal
 from .geometry import Point, Plane, Vector, LocalCoordinateSystem
 from .data import walk_data
+from .render import slice_normal
 
 class Dataset():
 	""" 
 		Wrapper class over the **pydicom.dataset.Dataset** class that provides 
 		additional methods for manipulating a dataset, including a local coordinate
 		system to map pixel locations over world coordinates	
+
+		Note:
+			The wrapped dataset may have been read without its pixel data (see the
+			*lazy* option of **Series.from_directory**). Its pixels are then read from
+			its file when **pixel_array** is accessed, and kept in the *slice_cache* 
+			of the series.
 	"""
 
-	def __init__(self, dataset, series, index):
+	def __init__(self, dataset, series, index, z_location=None):
 		self.dataset   = dataset
 		self.series    = series
 		self.index     = index
-
-		# construct local coordinate system
-		xx, xy, xz, yx, yy, yz = dataset.ImageOrientationPatient
-		x_vector = Vector(xx,xy,xz)
-		y_vector = Vector(yx,yy,yz)
-
-		self.transform = LocalCoordinateSystem(
-				dataset.ImagePositionPatient,
-				x_vector, y_vector,
-				dataset.PixelSpacing
-			)
+		self._transform = None
 
 		# accurate Z location to use instead of SliceLocation 
-		_,_,self._ZLocation = self.to_mm(0,0)
+		if z_location is None:
+			_,_,z_location = self.to_mm(0,0)
+		self._ZLocation = z_location
+
+	def _get_transform(self):
+		# construct local coordinate system, on first use
+		if self._transform is None:
+			xx, xy, xz, yx, yy, yz = self.dataset.ImageOrientationPatient
+			x_vector = Vector(xx,xy,xz)
+			y_vector = Vector(yx,yy,yz)
+
+			self._transform = LocalCoordinateSystem(
+					self.dataset.ImagePositionPatient,
+					x_vector, y_vector,
+					self.dataset.PixelSpacing
+				)
+
+		return self._transform
+
+	def _set_transform(self, transform): self._transform = transform
+	transform = property(_get_transform, _set_transform)
+	"""
+	Property holding the **LocalCoordinateSystem** mapping pixel locations of the 
+	dataset to world coordinates, built on first access
+	"""
 
 	def _getZ(self): return self._ZLocation
 	ZLocation = property(_getZ)
@@ -62,6 +85,66 @@ class Dataset():
 		x:-2.65 y:-184.74 z:-205.70
 	"""
 
+	def _get_pixel_array(self):
+		if "PixelData" in self.dataset or self.series is None:
+			return self.dataset.pixel_array
+
+		cache  = self.series.slice_cache
+		pixels = cache.get(self.dataset.filename)
+		if pixels is None:
+			pixels = self.read_pixels()
+			cache.put(self.dataset.filename, pixels)
+
+		return pixels
+
+	pixel_array = property(_get_pixel_array)
+	"""
+	Property returning the decoded pixel data of the dataset, read from its file 
+	on first access when the dataset was loaded without pixel data
+
+	Returns:
+		numpy.array: (Rows, Columns) array of stored pixel values
+	"""
+
+	def read_pixels(self):
+		"""
+		Decodes the pixel data of the dataset, bypassing the *slice_cache* of the series 
+
+		Returns:
+			numpy.array: (Rows, Columns) array of stored pixel values
+		"""
+		if "PixelData" in self.dataset:
+			pixels = self.dataset.pixel_array
+
+		# uncompressed pixel data located by a header index, read it as is
+		elif getattr(self.dataset, "pixel_location", None) is not None:
+			offset, length = self.dataset.pixel_location
+			dtype = np.dtype("<%s%d" % (
+				"i" if self.PixelRepresentation else "u", self.BitsAllocated // 8))
+
+			pixels = np.fromfile(self.dataset.filename, dtype=dtype, 
+								 count=length // dtype.itemsize, offset=offset)
+			pixels = pixels.reshape(self.Rows, self.Columns)
+
+		else:
+			pixels = pydicom.dcmread(self.dataset.filename).pixel_array
+
+		return self._stored_bits(pixels)
+
+	def _stored_bits(self, pixels):
+		""" clears the bits above BitsStored, or sign extends from the highest stored bit """
+		allocated = self.dataset.get("BitsAllocated")
+		unused = allocated - self.dataset.get("BitsStored", allocated) if allocated else 0
+
+		# bits above BitsStored may hold anything, such as overlays, left as is by some decoders
+		if unused <= 0 or pixels.dtype.kind not in "iu" or pixels.dtype.itemsize * 8 != allocated:
+			return pixels
+
+		if pixels.dtype.kind == "i":
+			return (pixels << unused) >> unused
+
+		return pixels & pixels.dtype.type((1 << (allocated - unused)) - 1)
+
 	def to_mm(self, x, y):
 		"""
 		Converts the local pixel coordinates to world coordinates measured 
@@ -98,6 +181,32 @@ class Dataset():
 		x,y = self.transform.to_local(coords)
 		return (int(x), int(y))
 
+	def to_mm_many(self, coords):
+		"""
+		Same as **to_mm**, converts many local pixel coordinates to world coordinates 
+		in millimeter units at once
+		
+		Args:
+			coords (numpy.array): (N,2) array of X and Y pixel coordinates
+		
+		Returns:
+			numpy.array: (N,3) array of world coordinates
+		"""
+		return self.transform.to_world_many(coords)
+
+	def to_pixel_many(self, coords):
+		"""
+		Same as **to_pixel**, converts many points from world coordinates in millimeter 
+		units to local coordinates, in pixels, at once
+		
+		Args:
+			coords (numpy.array, PointArray): (N,3) array of world coordinates
+		
+		Returns:
+			numpy.array: (N,2) integer array of local coordinates
+		"""
+		return self.transform.to_local_many(coords).astype(int)
+
 	def center(self):
 		"""
 		Returns the center of the dataset in world coordinates measured in 
@@ -122,7 +231,17 @@ class Dataset():
 			0.00X + 0.00Y + 1.00Z = -296.70
 		"""
 		ox,oy,oz = self.center()
-		return Plane.from_coords((ox,oy,oz),(ox,oy,oz+1.0))
+		nx,ny,nz = self.normal()
+		return Plane.from_coords((ox,oy,oz),(ox+nx,oy+ny,oz+nz))
+
+	def normal(self):
+		"""
+		Returns the direction normal to the dataset, see **dicom3d.render.slice_normal**
+
+		Returns:
+			numpy.array: unit vector, (0,0,1) for axial datasets
+		"""
+		return slice_normal(self.transform.x_vector.tuple(), self.transform.y_vector.tuple())
 
 	def topleft(self):
 		"""
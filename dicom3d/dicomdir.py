@@ -2,12 +2,90 @@ import os
 import pydicom
 import numpy as np
 
+# internal
+from .series import Series
+
+# attributes indexed at load time, for each level of the hierarchy
+RECORD_INDEXED = ("PatientID",)
+STUDY_INDEXED  = ("StudyInstanceUID", "StudyDate")
+SERIES_INDEXED = ("SeriesInstanceUID", "Modality", "SeriesNumber")
+
+def _key(value):
+	""" hashable index key of an attribute value, equal for values that compare equal """
+	if isinstance(value, int):
+		return int(value)
+	if hasattr(value, "original_string"):
+		return value.original_string
+	if isinstance(value, str):
+		return str(value)
+	return value
+
+def _read_records(filepath):
+	""" directory records of a DICOMDIR, as (record, children) pairs nested down to the image records """
+	dicom_dir = pydicom.dcmread(filepath)
+
+	# records are linked by the offsets of their items in the file
+	records = { record.seq_item_tell: record for record in dicom_dir.DirectoryRecordSequence }
+
+	def walk(offset):
+		entries = []
+		# each record is taken once, so that broken links cannot loop
+		while offset in records:
+			record = records.pop(offset)
+			children = walk(record.get("OffsetOfReferencedLowerLevelDirectoryEntity", 0))
+			if record.get("RecordInUseFlag", 0xFFFF) != 0:
+				entries.append((record, children))
+			offset = record.get("OffsetOfTheNextDirectoryRecord", 0)
+		return entries
+
+	return walk(dicom_dir.get("OffsetOfTheFirstDirectoryRecordOfTheRootDirectoryEntity", 0))
+
+def _file_id(record):
+	""" components of the referenced file path, a single one being read as a string """
+	file_id = record.ReferencedFileID
+	return [ file_id ] if isinstance(file_id, str) else list(file_id)
+
+class _Entry():
+	""" compact entry of the DICOMDIR hierarchy, accessed like the dictionaries it replaces """
+	__slots__ = ()
+
+	def __init__(self, **values):
+		for name in self.__slots__:
+			setattr(self, name, values.get(name))
+
+	def get(self, key, default=None):
+		return getattr(self, key, default) if key in self.__slots__ else default
+
+	def __getitem__(self, key):
+		if key not in self.__slots__:
+			raise KeyError(key)
+		return getattr(self, key)
+
+	def __setitem__(self, key, value):
+		if key not in self.__slots__:
+			raise KeyError(key)
+		setattr(self, key, value)
+
+class PatientEntry(_Entry):
+	""" patient record entry, holding its studies """
+	__slots__ = ("patient_id", "patient_name", "studies", "record")
+
+class StudyEntry(_Entry):
+	""" study entry, holding its series and the patient entry it belongs to """
+	__slots__ = ("id", "date", "desc", "series", "study", "parent")
+
+class SeriesEntry(_Entry):
+	""" series entry, holding its image files and the study entry it belongs to """
+	__slots__ = ("number", "desc", "modality", "images_count", "files", "datasets", "series", "parent")
+
 class DiicomDir():
 	def __init__(self):
 		self.records = None
 		self.all_studies = None
 		self.all_series = None
+		self.indexes = None
 		self.ignore_entries_without_pixel_spacing = True
+		self.lazy = False
 
 	def _check_attributes(self, entity, attrs):
 
@@ -25,8 +103,77 @@ class DiicomDir():
 
 		return True
 
-	def find_records(self, attrs):
+	def _build_indexes(self):
+		""" maps the values of indexed attributes to entries, for each level """
+		levels = (
+			("records", self.records,     "record", RECORD_INDEXED),
+			("studies", self.all_studies, "study",  STUDY_INDEXED),
+			("series",  self.all_series,  "series", SERIES_INDEXED))
+
+		self.indexes = {}
+		for level, entries, entity, attrs in levels:
+			index = self.indexes[level] = {}
+
+			for attr in attrs:
+				table = {}
+				for entry in entries:
+					value = entry.get(entity).get(attr)
+					if value is None:
+						continue
+
+					try:
+						table.setdefault(_key(value), []).append(entry)
+					except TypeError:
+						# unhashable (multi-valued) attribute, found by linear search only
+						table = None
+						break
+
+				if table is not None:
+					index[attr] = table
+
+	def _find_indexed(self, level, entity, attrs, parents=None, all_parents=None):
+		"""
+		finds entries of a level through its indexes, in the order of the given parents.
+		Returns None when no attribute of the query is indexed.
+		"""
+		index = self.indexes.get(level, {}) if self.indexes is not None else {}
+
+		# entries matching each indexed attribute
+		lookups, others = [], {}
+		for attr, value in attrs.items():
+			try:
+				lookups.append(index[attr].get(_key(value), []))
+			except (KeyError, TypeError):
+				others[attr] = value
+
+		if len(lookups) == 0:
+			return None
+
+		# walk the most selective one, checking the others by identity
+		lookups.sort(key=len)
+		matched = [ { id(entry) for entry in lookup } for lookup in lookups[1:] ]
+
+		results = [ entry for entry in lookups[0]
+						if all(id(entry) in ids for ids in matched) and \
+						   self._check_attributes(entry.get(entity), others) ]
+
+		# same order as a walk through all parents
+		if parents is None or parents is all_parents:
+			return results
+
+		children = {}
+		for entry in results:
+			children.setdefault(id(entry.parent), []).append(entry)
+
+		return [ entry for parent in parents for entry in children.get(id(parent), []) ]
+
+	def find_records(self, attrs, indexed=True):
 		""" finds records based on a dictionary of attributes """
+		if attrs is not None and indexed:
+			results = self._find_indexed("records", "record", attrs)
+			if results is not None:
+				return results
+
 		results = []
 
 		for record in self.records:
@@ -39,8 +186,13 @@ class DiicomDir():
 
 		return results
 
-	def find_studies(self, records, attrs):
+	def find_studies(self, records, attrs, indexed=True):
 		""" finds studies based on a dictionary of attributes, from a list of given records """
+		if attrs is not None and indexed:
+			results = self._find_indexed("studies", "study", attrs, records, self.records)
+			if results is not None:
+				return results
+
 		results = []
 
 		for record in records:
@@ -55,8 +207,13 @@ class DiicomDir():
 
 		return results
 
-	def find_series(self, studies, attrs):
+	def find_series(self, studies, attrs, indexed=True):
 		""" finds series based on a dictionary of attributes, from a list of given studies """
+		if attrs is not None and indexed:
+			results = self._find_indexed("series", "series", attrs, studies, self.all_studies)
+			if results is not None:
+				return results
+
 		results = []
 
 		for study in studies:
@@ -79,99 +236,94 @@ class DiicomDir():
 			if len(records) == 0:
 				return []
 		else:
-			records = list(self.records)
+			records = self.records
 
 		if study_attrs is not None:
 			studies = self.find_studies(records, study_attrs)
 			if len(studies) == 0: 
 				return []
 		else:
-			studies = list(self.all_studies)
+			studies = self.all_studies
 
 		if series_attrs is not None:
 			series = self.find_series(studies, series_attrs)
 			if len(series) == 0:
 				return []
 		else:
-			series = list(self.all_series)
+			series = self.all_series
 
-		return (records, studies, series)
+		return (list(records), list(studies), list(series))
 
-	def load(self, filepath):
-		""" loads a dicomdir from a given filepath """
+	def load(self, filepath, lazy=False):
+		"""
+		Loads a dicomdir from a given filepath. Records, studies and series are built
+		from the DICOMDIR records alone, the image files of a series being read when
+		requested with **datasets** or **load_series**, only their headers if lazy.
+		"""
 
 		# check if file exists
 		if not os.path.exists(filepath):
 			raise ValueError("Inexistent filepath: " + filepath) 
 
-		dicom_dir = pydicom.filereader.read_dicomdir(filepath)
 		base_dir = os.path.dirname(filepath)
 
 		records = []
 
 		# go through the patient record and print information
-		for patient_record in dicom_dir.patient_records:
+		for patient_record, studies in _read_records(filepath):
 
 			# add new record
 			record_studies = []
-			record_entry = {
-				"patient_id"   : patient_record.PatientID   if hasattr(patient_record, "PatientID") else "N/A",
-				"patient_name" : patient_record.PatientName if hasattr(patient_record, "PatientName") else "N/A",
-				"studies"      : record_studies,
-				"record"	   : patient_record
-			}
+			record_entry = PatientEntry(
+				patient_id   = patient_record.PatientID   if hasattr(patient_record, "PatientID") else "N/A",
+				patient_name = patient_record.PatientName if hasattr(patient_record, "PatientName") else "N/A",
+				studies      = record_studies,
+				record       = patient_record)
 			records.append(record_entry)
 
 			# for each stufy
-			studies = patient_record.children
-			for study in studies:
+			for study, all_series in studies:
 				
 				# add new study
 				study_series = []
-				study_entry = {
-					"id"     : study.StudyID          if hasattr(study, "StudyID") else "N/A",
-					"date"   : study.StudyDate        if hasattr(study, "StudyDate") else "N/A",
-					"desc"   : study.StudyDescription if hasattr(study, "StudyDescription") else "N/A",
-					"series" : study_series,
-					"study"  : study
-				}
+				study_entry = StudyEntry(
+					id     = study.StudyID          if hasattr(study, "StudyID") else "N/A",
+					date   = study.StudyDate        if hasattr(study, "StudyDate") else "N/A",
+					desc   = study.StudyDescription if hasattr(study, "StudyDescription") else "N/A",
+					series = study_series,
+					study  = study,
+					parent = record_entry)
 				record_studies.append(study_entry)
 
-				all_series = study.children
-
 				# go through each series
-				for series in all_series:
-					image_count = len(series.children)
+				for series, image_records in all_series:
+					image_count = len(image_records)
 					
 					# Put N/A in if no Series Description
 					if 'SeriesDescription' not in series:
 						series.SeriesDescription = "N/A"
 
+					# image files, read on demand
+					image_filenames = [os.path.join(base_dir, *_file_id(image_rec))
+									   for image_rec, _ in image_records]
+
 					# add new series
-					series_datasets = []
-					series_entry = {
-						"number"  : series.SeriesNumber      if hasattr(series, "SeriesNumber") else "N/A",
-						"desc"    : series.SeriesDescription if hasattr(series, "SeriesDescription") else "N/A",
-						"modality": series.Modality          if hasattr(series, "Modality") else "N/A",
-						"images_count": image_count,
-						"datasets" : series_datasets,
-						"series"   : series
-					}
+					series_entry = SeriesEntry(
+						number   = series.SeriesNumber      if hasattr(series, "SeriesNumber") else "N/A",
+						desc     = series.SeriesDescription if hasattr(series, "SeriesDescription") else "N/A",
+						modality = series.Modality          if hasattr(series, "Modality") else "N/A",
+						images_count = image_count,
+						files    = image_filenames,
+						datasets = None,
+						series   = series,
+						parent   = study_entry)
 					study_series.append(series_entry)
 
-					# open and read each dataset
-					image_records = series.children
-					image_filenames = [os.path.join(base_dir, *image_rec.ReferencedFileID)
-									   for image_rec in image_records]
-
-					datasets = [pydicom.dcmread(image_filename)
-								for image_filename in image_filenames]
-
-					series_datasets.extend(datasets)
-
 					# Don't load series with datasets that have no pixel spacing
-					if self.ignore_entries_without_pixel_spacing:
-						if hasattr(datasets[0],"PixelSpacing") == False:
+					if self.ignore_entries_without_pixel_spacing and len(image_filenames) > 0:
+						header = pydicom.dcmread(image_filenames[0], stop_before_pixels=True,
+												 specific_tags=["PixelSpacing"])
+						if hasattr(header,"PixelSpacing") == False:
 							print("warning: ignoring series '%s' (%s) because datasets have no PixelSpacing attribute" % (
 								series_entry.get("number"), series_entry.get("desc")) )
 							study_series.remove(series_entry)
@@ -180,9 +332,56 @@ class DiicomDir():
 		self.records 	= records
 		self.all_studies = self.find_studies(self.records, None) 
 		self.all_series  = self.find_series (self.all_studies, None)
+		self.lazy = lazy
+
+		self._build_indexes()
 
 		return
 
+	def datasets(self, series_entry, lazy=None, workers=None):
+		"""
+		Reads the datasets of a series, once, keeping them in the series entry
+
+		Args:
+			series_entry (SeriesEntry): series entry, as returned by **find_series**
+			lazy (bool, optional): only read the headers, defaults to the **load** setting
+			workers (int, optional): number of threads reading files, see **Series.from_directory**
+
+		Returns:
+			list: pydicom.dataset.Dataset objects, in the order of the DICOMDIR records
+		"""
+		if series_entry.get("datasets") is None:
+			lazy = self.lazy if lazy is None else lazy
+			series_entry["datasets"] = Series._read(series_entry.get("files"), lazy, workers)
+
+		return series_entry.get("datasets")
+
+	def load_series(self, series_entry, check_homogeneity=True, fix_z_duplicates=False,
+					lazy=None, workers=None):
+		"""
+		Constructs a **dicom3d.Series** from a series entry, reading its datasets if needed
+
+		Args:
+			series_entry (SeriesEntry): series entry, as returned by **find_series**
+			check_homogeneity (bool, optional): see **Series**
+			fix_z_duplicates (bool, optional): drops datasets duplicated on the Z axis,
+				see **Series.fix_z_duplicates**
+			lazy (bool, optional): only read the headers, defaults to the **load** setting
+			workers (int, optional): number of threads reading files
+
+		Returns:
+			Series: series object of the entry datasets
+
+		Examples:
+			>>> dd.load("/media/cdrom/DICOMDIR")
+			>>> series = dd.load_series(dd.find_series(dd.all_studies, { "SeriesNumber": 2 })[0])
+		"""
+		datasets = self.datasets(series_entry, lazy, workers)
+		if fix_z_duplicates:
+			datasets = Series.fix_z_duplicates(datasets)
+
+		return Series(datasets, check_homogeneity = check_homogeneity)
+
 	def print(self):
 		""" Prints loaded records, studies and series"""
 
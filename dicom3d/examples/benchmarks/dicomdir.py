@@ -0,0 +1,99 @@
+#! /usr/bin/env python3
+import os
+import time
+import shutil
+import tempfile
+import pydicom
+from   pydicom.fileset import FileSet
+from   pydicom.uid import generate_uid
+import dicom3d.dicomdir as ddir
+from   dicom3d.data import synthetic_datasets
+
+intro = """
+===-----------------------------------------------------===
+ |                DICOMDIR QUERY SPEED                   |
+===-----------------------------------------------------===
+
+    This example measures the time needed to query a
+    large synthetic DICOMDIR with 'DiicomDir.find_*',
+    through the attribute indexes built at load time
+    and by walking every entry.
+
+    Queries on PatientID, StudyInstanceUID, StudyDate,
+    SeriesInstanceUID, Modality and SeriesNumber are
+    dictionary lookups, other attributes are searched
+    linearly.
+
+===-----------------------------------------------------===
+"""
+
+MODALITIES = ("CT", "MR", "PT", "US")
+
+def write_dicomdir(path, patients=100, studies=4, series=5):
+	""" writes a DICOMDIR of patients x studies x series single image series """
+	fileset = FileSet()
+
+	for patient in range(0, patients):
+		for study in range(0, studies):
+			study_uid = generate_uid()
+
+			for number in range(0, series):
+				dataset = synthetic_datasets(count=1, rows=8, columns=8)[0]
+				dataset.PatientID         = "P%05d" % (patient)
+				dataset.PatientName       = "Patient^%05d" % (patient)
+				dataset.StudyInstanceUID  = study_uid
+				dataset.StudyID           = str(study)
+				dataset.StudyDate         = "2020%02d%02d" % (study + 1, patient % 28 + 1)
+				dataset.StudyTime         = "120000"
+				dataset.AccessionNumber   = ""
+				dataset.Modality          = MODALITIES[number % len(MODALITIES)]
+				dataset.SeriesNumber      = number + 1
+				fileset.add(dataset)
+
+	fileset.write(path)
+	return os.path.join(path, "DICOMDIR")
+
+def measure(query, repeat):
+	start = time.perf_counter()
+	for _ in range(0, repeat):
+		results = query()
+	return results, (time.perf_counter() - start) / repeat
+
+if __name__ == "__main__":
+	print(intro)
+
+	path = tempfile.mkdtemp(prefix="dicom3d-")
+	try:
+		print("Writing synthetic DICOMDIR to '%s'.." % (path))
+		dicomdir = write_dicomdir(path)
+
+		dd = ddir.DiicomDir()
+		start = time.perf_counter()
+		dd.load(dicomdir)
+
+		print("DICOMDIR has %d records, %d studies, %d series, loaded in %.2fs (pydicom %s)" % (
+			len(dd.records), len(dd.all_studies), len(dd.all_series),
+			time.perf_counter() - start, pydicom.__version__))
+
+		study   = dd.all_studies[len(dd.all_studies) // 2].get("study")
+		series  = dd.all_series[len(dd.all_series) // 2].get("series")
+
+		queries = [
+			("PatientID",         lambda indexed: dd.find_records({ "PatientID": "P00042" }, indexed)),
+			("StudyInstanceUID",  lambda indexed: dd.find_studies(dd.records, { "StudyInstanceUID": study.StudyInstanceUID }, indexed)),
+			("StudyDate",         lambda indexed: dd.find_studies(dd.records, { "StudyDate": "20200215" }, indexed)),
+			("SeriesInstanceUID", lambda indexed: dd.find_series(dd.all_studies, { "SeriesInstanceUID": series.SeriesInstanceUID }, indexed)),
+			("Modality+Number",   lambda indexed: dd.find_series(dd.all_studies, { "Modality": "MR", "SeriesNumber": 2 }, indexed)),
+		]
+
+		print("---\n%-18s %12s %12s %8s %s" % ("query", "linear", "indexed", "speedup", "identical"))
+
+		for name, query in queries:
+			linear,  t_linear  = measure(lambda: query(False), 20)
+			indexed, t_indexed = measure(lambda: query(True), 20)
+
+			print("%-18s %10.1fus %10.1fus %7.0fx  %s" % (
+				name, t_linear * 1.e6, t_indexed * 1.e6, t_linear / t_indexed,
+				[ id(entry) for entry in linear ] == [ id(entry) for entry in indexed ]))
+	finally:
+		shutil.rmtree(path)
@@ -0,0 +1,81 @@
+#! /usr/bin/env python3
+import time
+import numpy as np
+from   dicom3d.geometry import Point, Vector, Plane, PointArray, VectorArray, radians
+
+intro = """
+===-----------------------------------------------------===
+ |                 BATCHED GEOMETRY SPEED                |
+===-----------------------------------------------------===
+
+    This example measures the time needed to transform
+    100000 points and vectors one 'Point' or 'Vector'
+    object at a time, and all at once with 'PointArray'
+    and 'VectorArray', which hold them in a single
+    (N,3) numpy array.
+
+===-----------------------------------------------------===
+"""
+
+COUNT = 100000
+
+def measure(operation):
+	start = time.perf_counter()
+	result = operation()
+	return np.asarray(result, dtype=float), time.perf_counter() - start
+
+if __name__ == "__main__":
+	print(intro)
+
+	rng = np.random.default_rng(0)
+	coords = rng.uniform(-200, 200, size=(COUNT, 3))
+	coords[:,2] = np.round(coords[:,2])
+
+	points  = [ Point(x, y, z) for x, y, z in coords.tolist() ]
+	vectors = [ Vector(i, j, k) for i, j, k in coords.tolist() ]
+	point_array  = PointArray(points)
+	vector_array = VectorArray(vectors)
+
+	origin = Point(10, -20, 30)
+	axis   = Vector(1, 2, -1)
+	plane  = Plane.from_axes("xy").move(Point(0, 0, 12))
+
+	unresolved = coords.copy()
+	unresolved[:,2] = np.nan
+
+	operations = [
+		("distance",
+			lambda: [ point.distance(origin) for point in points ],
+			lambda: point_array.distance(origin)),
+		("move",
+			lambda: [ tuple(point.move(axis, 5.0)) for point in points ],
+			lambda: point_array.move(axis, 5.0).numpy()),
+		("dot",
+			lambda: [ vector.dot(axis) for vector in vectors ],
+			lambda: vector_array.dot(axis)),
+		("unit",
+			lambda: [ vector.unit().tuple() for vector in vectors ],
+			lambda: vector_array.unit().numpy()),
+		("rotate axis",
+			lambda: [ vector.rotate("z", radians(30)).tuple() for vector in vectors ],
+			lambda: vector_array.rotate("z", radians(30)).numpy()),
+		("rotate vector",
+			lambda: [ vector.rotate(axis, radians(30)).tuple() for vector in vectors ],
+			lambda: vector_array.rotate(axis, radians(30)).numpy()),
+		("plane intersects",
+			lambda: [ plane.intersects(point) for point in points ],
+			lambda: plane.intersects(point_array)),
+		("plane resolve",
+			lambda: [ tuple(plane.resolve((x, y, None))) for x, y, _ in coords.tolist() ],
+			lambda: plane.resolve(PointArray(unresolved)).numpy()),
+	]
+
+	print("---\n%-18s %12s %12s %8s %s" % ("operation", "objects", "arrays", "speedup", "identical"))
+
+	for name, objects, arrays in operations:
+		expected, t_objects = measure(objects)
+		result,   t_arrays  = measure(arrays)
+
+		print("%-18s %10.1fms %10.1fms %7.0fx  %s" % (
+			name, t_objects * 1.e3, t_arrays * 1.e3, t_objects / t_arrays,
+			np.allclose(expected, result, rtol=0, atol=1.e-9)))
@@ -0,0 +1,79 @@
+#! /usr/bin/env python3
+import os
+import time
+import shutil
+import tempfile
+import dicom3d as d3d
+from   dicom3d.data import synthetic_datasets
+
+intro = """
+===-----------------------------------------------------===
+ |                 SERIES LOADING SPEED                  |
+===-----------------------------------------------------===
+
+    This example measures the time needed to load a
+    synthetic series of 1000 DICOM files with
+    'Series.from_directory()', reading the files on
+    a growing number of threads.
+
+    Cold runs evict the files from the operating system
+    page cache before loading (where supported), warm
+    runs read them from memory. Threads help the most
+    with cold files, or files on network filesystems.
+
+===-----------------------------------------------------===
+"""
+
+def evict(files):
+	""" drops the files from the page cache, so that they are read from disk again """
+	if not hasattr(os, "posix_fadvise"):
+		return False
+
+	for filename in files:
+		fd = os.open(filename, os.O_RDONLY)
+		try:
+			os.fsync(fd)
+			os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+		finally:
+			os.close(fd)
+
+	return True
+
+def measure(path, workers):
+	start = time.perf_counter()
+	series = d3d.Series.from_directory(path, workers=workers)
+	return series, time.perf_counter() - start
+
+if __name__ == "__main__":
+	print(intro)
+
+	path = tempfile.mkdtemp(prefix="dicom3d-")
+	try:
+		print("Writing synthetic series to '%s'.." % (path))
+
+		files = []
+		for idx, dataset in enumerate(synthetic_datasets(count=1000, rows=128, columns=128)):
+			filename = os.path.join(path, "image%04d.dcm" % (idx))
+			dataset.save_as(filename, write_like_original=False)
+			files.append(filename)
+
+		reference, _ = measure(path, 1)
+		order = [ dataset.SOPInstanceUID for dataset in reference.datasets ]
+
+		print("---\n%-8s %12s %12s %s" % ("workers", "cold", "warm", "identical"))
+
+		for workers in (1, 2, 4, 8, 16):
+			cold = evict(files)
+			series, t_cold = measure(path, workers)
+			_, t_warm = measure(path, workers)
+
+			identical = order == [ dataset.SOPInstanceUID for dataset in series.datasets ] and \
+						reference.mapping == series.mapping
+
+			print("%-8d %10.2fs%s %10.2fs  %s" % (
+				workers, t_cold, "" if cold else "*", t_warm, identical))
+
+		if not hasattr(os, "posix_fadvise"):
+			print("\n* page cache eviction is not supported here, cold runs are warm")
+	finally:
+		shutil.rmtree(path)
@@ -0,0 +1,55 @@
+#! /usr/bin/env python3
+import time
+import multiprocessing
+import numpy as np
+import dicom3d as d3d
+from   dicom3d.data import synthetic_datasets
+from   dicom3d.parallel import ParallelRenderer
+
+intro = """
+===-----------------------------------------------------===
+ |               PARALLEL SECTION RENDERING              |
+===-----------------------------------------------------===
+
+    This example measures the throughput of rendering
+    many sections of a synthetic volumetric scan on a
+    pool of worker processes.
+
+    The workers share the cached volume through shared
+    memory, so the throughput should grow with the
+    number of processes, up to the number of cores.
+
+===-----------------------------------------------------===
+"""
+
+if __name__ == "__main__":
+	print(intro)
+
+	print("Generating synthetic series..")
+	series = d3d.Series(synthetic_datasets(count=160, rows=256, columns=256))
+	origin = series.middle().center()
+
+	# sections rotating about the Z axis
+	plane    = d3d.Plane.from_axes("yz")
+	sections = [ d3d.Section.from_plane(series, plane.rotate("z", d3d.radians(angle)).move(origin), origin)
+					for angle in range(0, 360, 1) ]
+
+	size = (256, 256)
+
+	start = time.perf_counter()
+	reference = np.array([ section.image(size, "trilinear") for section in sections ])
+	elapsed = time.perf_counter() - start
+
+	print("---\n%-10s %10s %14s %s" % ("processes", "time", "sections/s", "identical"))
+	print("%-10s %8.2fs %14.1f %s" % ("serial", elapsed, len(sections) / elapsed, True))
+
+	processes = 1
+	while processes <= multiprocessing.cpu_count():
+		with ParallelRenderer(series, processes=processes) as renderer:
+			start = time.perf_counter()
+			images = renderer.render(sections, size, "trilinear")
+			elapsed = time.perf_counter() - start
+
+		print("%-10d %8.2fs %14.1f %s" % (
+			processes, elapsed, len(sections) / elapsed, np.array_equal(reference, images)))
+		processes *= 2
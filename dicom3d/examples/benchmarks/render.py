@@ -0,0 +1,91 @@
+#! /usr/bin/env python3
+import time
+import numpy as np
+import dicom3d as d3d
+from   dicom3d.data import synthetic_datasets
+
+intro = """
+===-----------------------------------------------------===
+ |                 SECTION RENDERING SPEED               |
+===-----------------------------------------------------===
+
+    This example measures the time needed to render
+    sections of a synthetic volumetric scan.
+
+    It compares the vectorized renderer used by
+    'Section.image()' with the per-pixel loop dicom3d
+    used before, and checks that both produce the exact
+    same images.
+
+===-----------------------------------------------------===
+"""
+
+def per_pixel_image(section, size):
+	""" reference implementation: walks the section one pixel at a time """
+	max_lines, max_width = size
+	ox, oy = -max_width//2, -max_lines//2
+	image  = np.zeros((max_lines, max_width), dtype=np.int64)
+	series = section.series
+
+	for line_y in range(0, max_lines):
+		sx,sy,sz = section.to_mm(0 + ox, line_y + oy)
+		ex,ey,ez = section.to_mm(max_width + ox, line_y + oy)
+		ix,iy,iz = (ex-sx)/max_width, (ey-sy)/max_width,(ez-sz)/max_width
+
+		dataset = series.at_z(sz)
+		if dataset is None:
+			continue
+
+		pixarr = dataset.pixel_array
+		for i in range(0, max_width):
+			x, y = dataset.to_pixel((sx,sy,sz))
+			sx, sy, sz = sx + ix, sy + iy, sz + iz
+
+			if x < 0 or x >= dataset.Columns: continue
+			if y < 0 or y >= dataset.Rows   : continue
+
+			if dataset.intersects_z(sz) == False:
+				dataset = series.at_z(sz)
+				if dataset is None:
+					break
+				pixarr = dataset.pixel_array
+
+			image[line_y, i] = pixarr[y,x]
+
+	return image
+
+def measure(function, *args):
+	start = time.perf_counter()
+	result = function(*args)
+	return result, time.perf_counter() - start
+
+if __name__ == "__main__":
+	print(intro)
+
+	print("Generating synthetic series..")
+	series = d3d.Series(synthetic_datasets(count=120, rows=256, columns=256))
+	origin = series.middle().center()
+
+	# warm up the volume cache, so that it is not measured
+	series.cache()
+
+	planes = [
+		("axial"   , d3d.Plane.from_axes("xy")),
+		("sagittal", d3d.Plane.from_axes("xz")),
+		("coronal" , d3d.Plane.from_axes("yz")),
+		("oblique" , d3d.Plane.from_axes("yz").rotate("z", d3d.radians(30))
+											  .rotate("x", d3d.radians(20))),
+	]
+
+	size = (256, 256)
+	print("---\n%-10s %12s %12s %10s %s" % ("section", "per-pixel", "vectorized", "speedup", "identical"))
+
+	for name, plane in planes:
+		section = d3d.Section.from_plane(series, plane.move(origin), origin)
+
+		reference, t_reference = measure(per_pixel_image, section, size)
+		image, t_image = measure(section.image, size)
+
+		print("%-10s %10.1fms %10.1fms %9.1fx %s" % (
+			name, t_reference * 1000, t_image * 1000,
+			t_reference / t_image, np.array_equal(reference, image)))
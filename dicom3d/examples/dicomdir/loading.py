@@ -36,7 +36,7 @@ def count_images(dd):
 
 	images = 0
 	for series in dd.all_series:
-		images += len(series.get("datasets"))
+		images += series.get("images_count")
 
 	return images
 
@@ -86,7 +86,7 @@ if __name__ == "__main__":
 
 	# constructing a dicom3d series from a DICOMDIR
 	print("---\nConstructing a dicom3d series from DICOMDIR")
-	datasets = dd.all_series[0].get("datasets")
+	datasets = dd.datasets(dd.all_series[0])
 	
 	# some DICOMDIR have duplicate datasets on the Z axis
 	# this experimental function attempts to fix it
@@ -15,9 +15,9 @@ intro = """
     of dicom3d's reconstructed sections. It needs a 
     volumetric scan to build sections from.
 
-    This example will first list the planes and origins
-    for each sections to be constructed and then it will
-    create an animated .GIF file using 'imageio' library.
+    This example sweeps a section through the volume,
+    translating and rotating it, and writes each image
+    to an animated .GIF file using 'imageio' library.
     
     The resulted animation will be saved to a file named
     'rotated.gif' in the current directory.
@@ -33,7 +33,7 @@ def select_series_path():
 		search_dirs = True,
 		selection_name = "series" )
 
-def construct_sectioning_path():
+def sweep_sections(image_size):
     global series
 
     # get mid-dataset and its center
@@ -45,36 +45,43 @@ def construct_sectioning_path():
     x2,_,_ = middle.to_mm(middle.Columns,0)
 
     origin = d3d.Point((x2-x1)/2 + x1, y, z)
+    section = d3d.Section.from_plane(series, plane.move(origin), origin)
 
-    path = []
+    # advance to center by y
+    step_cnt = 30
+    step     = (0, (center.y - origin.y)/step_cnt, 0)
 
-    step_cnt  = 30
-    step_size = (center.y - origin.y)/step_cnt
+    print("Advancing %d sections from: %s" % (step_cnt, section.transform.origin))
+    yield from section.sweep(image_size, step_cnt, step=step)
+    section = section.frame(step_cnt, step=step)
 
-    # advance to center by y
-    for i in range(0,step_cnt):
-        path.append((origin, plane))
-        origin = origin.copy()
-        origin.y += step_size
-    
-    # rotate plane 
+    # rotate plane, each section being built from the rotated plane so that
+    # its orientation follows the datasets it crosses
     step_cnt = 45
-    step_size = 90.0/step_cnt
+    origin   = section.transform.origin
+    oxz      = plane
 
-    for i in range(0, step_cnt):
-        plane = plane.rotate("z", d3d.radians(step_size))
-        path.append((origin, plane))
+    print("Rotating %d sections about: %s" % (step_cnt, origin))
+    for _ in range(0, step_cnt):
+        plane = plane.rotate("z", d3d.radians(90.0/step_cnt))
+        print("Section origin: %s Rotation Angle: %.2f" % (
+            origin, d3d.degrees(plane.angle(oxz)) ))
+
+        try:
+            section = d3d.Section.from_plane(series, plane.move(origin), origin)
+            yield section.image(image_size)
+        except Exception as e:
+            print("Exception for section (%s)" % (e))
 
     # translate to right
     step_cnt = 30
-    step_size = (x2-origin.x)/step_cnt
+    step     = ((x2-origin.x)/step_cnt, 0, 0)
 
-    for i in range(0, step_cnt):
-        origin = origin.copy()
-        origin.x += step_size
-        path.append((origin, plane))
+    # the first step is taken before rendering, the rotated section was already rendered
+    section = section.frame(1, step=step)
 
-    return path
+    print("Translating %d sections from: %s" % (step_cnt, section.transform.origin))
+    yield from section.sweep(image_size, step_cnt, step=step)
 
 if __name__ == "__main__":
 
@@ -102,25 +109,8 @@ if __name__ == "__main__":
     print("Section size         : %.1f x %.1f mm" % (image_size[1], image_size[0] ))
     print("---")
 
-    # create path for this animation
-    path = construct_sectioning_path()
-
-    oxz = d3d.Plane.from_axes("xz")
-    # create images
-    images = []
-    for origin, plane in path:
-        
-        plane = plane.move(origin)
-        angle = plane.angle(oxz)
-        print("Section origin: %s Rotation Angle: %.2f" % (
-            origin, d3d.degrees(angle) ))
-
-        try:
-            section = d3d.Section.from_plane(series, plane, origin)
-            image = section.image(image_size)
-            images.append(image)
-        except Exception as e:
-            print("Exception for section (%s)" % (e))
-            pass
-
-    imageio.mimsave('./rotate.gif', images)
+    # images are rendered one at a time while writing the animation,
+    # so that memory does not grow with the number of frames
+    with imageio.get_writer('./rotate.gif', mode='I') as writer:
+        for image in sweep_sections(image_size):
+            writer.append_data(image)
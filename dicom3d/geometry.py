@@ -684,6 +684,10 @@ class Plane():
 		Returns:
 			Point: resulting Point
 
+		Note:
+			For a **PointArray**, the component to resolve is marked as NaN on each point,
+			points that can't be resolved keep it
+
 		Examples:
 			To find the Z component of a point that lies on the plane
 			and has only the X and Y components defined:
@@ -693,6 +697,9 @@ class Plane():
 			>>> print("Resolved point is X:10 Y:10 Z:%.2f" % (z))
 			Resolved point is X:10 Y:10 Z:-5.77
 		"""
+		if isinstance(point, PointArray):
+			return self._resolve_array(point)
+
 		x,y,z = point
 		a,b,c = self.normal.tuple()
 		
@@ -713,6 +720,22 @@ class Plane():
 
 		return Point(x,y,z)
 
+	def _resolve_array(self, points):
+		x,y,z = points.x, points.y, points.z
+		a,b,c = self.normal.tuple()
+
+		# same precedence as for a single point: X, then Y, then Z
+		nx = np.isnan(x)
+		ny = np.isnan(y) & ~nx
+		nz = np.isnan(z) & ~nx & ~ny
+
+		result = points.copy()
+		if a != 0: result.x[nx] = (self.d - c * z[nx] - b * y[nx])/a
+		if b != 0: result.y[ny] = (self.d - c * z[ny] - a * x[ny])/b
+		if c != 0: result.z[nz] = (self.d - b * y[nz] - a * x[nz])/c
+
+		return result
+
 	def angle(self, p):
 		"""
 		Calculates the angle made by the given plane with another one
@@ -734,11 +757,15 @@ class Plane():
 		Verifies if a given point intersects the current plane
 		
 		Args:
-			point (tuple, Point): point argument to check intersection with
+			point (tuple, Point, PointArray): point argument to check intersection with
 		
 		Returns:
-			bool: **True** if intersects plane or **False** otherwise
+			bool: **True** if intersects plane or **False** otherwise, or an array
+			of booleans for a **PointArray**
 		"""
+		if isinstance(point, PointArray):
+			point = (point.x, point.y, point.z)
+
 		x,y,z = point
 		a,b,c = self.normal
 		v = a*x + b*y + c*z
@@ -754,6 +781,410 @@ class Plane():
 		return "%.2fX + %.2fY + %.2fZ = %.2f" % (
 			a, b, c, self.d)
 #
+# batched points and vectors
+#
+def _rotation_by_axis(axis, angle):
+	""" rotation matrices about an axis, for a scalar or an array of angles """
+	cos, sin = np.cos(angle), np.sin(angle)
+	one, zero = np.ones_like(cos), np.zeros_like(cos)
+
+	axis = axis.lower()
+	if axis == "z":
+		rows = [[ cos, -sin, zero ], [ sin, cos, zero ], [ zero, zero, one ]]
+	elif axis == "y":
+		rows = [[ cos, zero, sin ], [ zero, one, zero ], [ -sin, zero, cos ]]
+	elif axis == "x":
+		rows = [[ one, zero, zero ], [ zero, cos, -sin ], [ zero, sin, cos ]]
+	else:
+		raise ValueError("invalid axis given '%s'" % (axis))
+
+	return np.moveaxis(np.array(rows, dtype=float), (0, 1), (-2, -1))
+
+def _rotation_by_vector(vectors, angle):
+	""" rotation matrices about unit vectors, same as **Vector.rotate_by_vector** """
+	cos, sin = np.cos(angle), np.sin(angle)
+	ux, uy, uz = vectors[...,0], vectors[...,1], vectors[...,2]
+	u2x, u2y, u2z = ux * ux, uy * uy, uz * uz
+
+	rows = [
+		[ cos + u2x * (1-cos),           ux * uy * (1-cos) - uz * sin,  ux * uz * (1-cos) + uy * sin ],
+		[ uy * ux * (1-cos) + uz * sin,  cos + u2y * (1-cos),           uy * uz * (1-cos) - ux * sin ],
+		[ uz * ux * (1-cos) - uy * sin,  uz * uy * (1-cos) + ux * sin,  cos + u2z * (1-cos) ]
+	]
+	rows = [ np.broadcast_arrays(*row) for row in rows ]
+	return np.moveaxis(np.array(rows, dtype=float), (0, 1), (-2, -1))
+
+class PointArray():
+	"""
+		Class implementing point operations over many points at once, held in a
+		contiguous (N,3) numpy array instead of one **Point** object each
+
+		Args:
+			points (numpy.array, list): (N,3) array, or list of **Point** objects or tuples
+
+		Examples:
+			>>> points = PointArray([ Point(0,0,0), (10,0,0), (0,10,0) ])
+			>>> points.distance(Point(0,0,0))
+			array([ 0., 10., 10.])
+			>>> points.move("z", 5.0)[1]
+			x:10.00 y:0.00 z:5.00
+	"""
+
+	def __init__(self, points):
+		if not isinstance(points, np.ndarray):
+			points = [ tuple(point) for point in points ]
+
+		self.array = np.array(points, dtype=float).reshape(-1, 3)
+
+	def _getx(self): return self.array[:,0]
+	def _gety(self): return self.array[:,1]
+	def _getz(self): return self.array[:,2]
+
+	x = property(_getx)
+	"""
+		Property holding a view of the **x** components of the points
+	"""
+	y = property(_gety)
+	"""
+		Property holding a view of the **y** components of the points
+	"""
+	z = property(_getz)
+	"""
+		Property holding a view of the **z** components of the points
+	"""
+
+	def copy(self):
+		"""
+		Creates a copy of itself
+		
+		Returns:
+			PointArray: object copied from self
+		"""
+		return PointArray(self.array)
+
+	def numpy(self):
+		"""
+		Returns:
+			numpy.array: the (N,3) array holding the points
+		"""
+		return self.array
+
+	def points(self):
+		"""
+		Returns:
+			list: **Point** objects, one for each point
+		"""
+		return [ Point(x,y,z) for x,y,z in self.array.tolist() ]
+
+	def distance(self, to):
+		"""
+		Calculates the distance from each point to the given point, or to the
+		corresponding point of another array
+		
+		Args:
+			to (Point, tuple, PointArray): end point(s) to calculate distance to
+		
+		Returns:
+			numpy.array: (N,) array of distances
+		"""
+		x,y,z = _components(to)
+		return np.sqrt(
+			(self.x - x) ** 2 +
+			(self.y - y) ** 2 + 
+			(self.z - z) ** 2 )
+
+	def move(self, by, distance):
+		"""
+		Translates the points by a vector and a given distance
+		
+		Args:
+			by (str, Vector, VectorArray): axis name ("x", "y" or "z"), or vector(s) 
+				describing translate direction
+			distance (float, numpy.array): distance, or (N,) array of distances
+		
+		Returns:
+			PointArray: translated points
+		"""
+		if type(by) is str:
+			by = Vector.from_axis(by)
+
+		i,j,k = _components(by)
+		distance = np.asarray(distance, dtype=float)
+
+		return PointArray(np.stack([
+			self.x + distance * i,
+			self.y + distance * j,
+			self.z + distance * k ], axis=-1))
+
+	def intersects(self, plane):
+		"""
+		Same as **dicom3d.Plane.intersects**, verifies intersection of each point with a plane
+		
+		Args:
+			plane (Plane): plane to verify intersection with
+		
+		Returns:
+			numpy.array: (N,) array of booleans
+		"""
+		return plane.intersects(self)
+
+	def __len__(self):
+		return len(self.array)
+
+	def __getitem__(self, item):
+		if isinstance(item, (int, np.integer)):
+			return Point(*self.array[item].tolist())
+		return PointArray(self.array[item])
+
+	def __iter__(self):
+		for x,y,z in self.array.tolist():
+			yield Point(x,y,z)
+
+	def __repr__(self):
+		return "PointArray(%d points)" % (len(self))
+
+class VectorArray():
+	"""
+		Class implementing vector algebra over many vectors at once, held in a
+		contiguous (N,3) numpy array instead of one **Vector** object each
+
+		Args:
+			vectors (numpy.array, list): (N,3) array, or list of **Vector** objects or tuples
+
+		Examples:
+			>>> vectors = VectorArray.from_coords(PointArray(origins), PointArray(targets))
+			>>> lengths = vectors.norm()
+			>>> rotated = vectors.unit().rotate("z", radians(30))
+	"""
+
+	def __init__(self, vectors):
+		if not isinstance(vectors, np.ndarray):
+			vectors = [ tuple(vector) for vector in vectors ]
+
+		self.array = np.array(vectors, dtype=float).reshape(-1, 3)
+
+	def _geti(self): return self.array[:,0]
+	def _getj(self): return self.array[:,1]
+	def _getk(self): return self.array[:,2]
+
+	i = property(_geti)
+	"""
+		Property holding a view of the **i** components of the vectors
+	"""
+	j = property(_getj)
+	"""
+		Property holding a view of the **j** components of the vectors
+	"""
+	k = property(_getk)
+	"""
+		Property holding a view of the **k** components of the vectors
+	"""
+
+	@staticmethod
+	def from_coords(origins, targets):
+		"""
+		Constructs vectors from pairs of points in space
+		
+		Args:
+			origins (Point, PointArray): origin point(s)
+			targets (Point, PointArray): target point(s)
+		
+		Returns:
+			VectorArray: resulting vectors
+		"""
+		xo,yo,zo = _components(origins)
+		xt,yt,zt = _components(targets)
+		return VectorArray(np.stack(np.broadcast_arrays(xt-xo, yt-yo, zt-zo), axis=-1))
+
+	def copy(self):
+		"""
+		Creates a copy of itself
+		
+		Returns:
+			VectorArray: object copied from self
+		"""
+		return VectorArray(self.array)
+
+	def numpy(self):
+		"""
+		Returns:
+			numpy.array: the (N,3) array holding the vectors
+		"""
+		return self.array
+
+	def vectors(self):
+		"""
+		Returns:
+			list: **Vector** objects, one for each vector
+		"""
+		return [ Vector(i,j,k) for i,j,k in self.array.tolist() ]
+
+	def dot(self, v):
+		"""
+		Calculates the dot product of each vector with a given vector, or with the
+		corresponding vector of another array
+		
+		Args:
+			v (Vector, VectorArray): dot product argument
+		
+		Returns:
+			numpy.array: (N,) array of dot products
+		"""
+		i,j,k = _components(v)
+		return self.i * i + self.j * j + self.k * k
+
+	def mul(self, v):
+		"""
+		Multiplies the vectors with a scalar value, or an (N,) array of values
+		
+		Returns:
+			VectorArray: resulting vectors
+		"""
+		return VectorArray(self.array * np.asarray(v, dtype=float)[...,None])
+
+	def div(self, v):
+		"""
+		Divides the vectors by a scalar value, or an (N,) array of values
+		
+		Returns:
+			VectorArray: resulting vectors
+		"""
+		return VectorArray(self.array / np.asarray(v, dtype=float)[...,None])
+
+	def norm(self):
+		"""
+		Returns:
+			numpy.array: (N,) array of vector lengths
+		"""
+		return norm(self.array, axis=1)
+
+	def unit(self):
+		"""
+		Returns:
+			VectorArray: unit vectors corresponding to these vectors
+		"""
+		return VectorArray(self.array / self.norm()[:,None])
+
+	def invert(self):
+		"""
+		Returns:
+			VectorArray: vectors pointing in the opposite directions
+		"""
+		return VectorArray(-self.array)
+
+	def angle(self, vector):
+		"""
+		Calculates the angles in radians between these vectors and the given vector,
+		or the corresponding vectors of another array, same as **Vector.angle**
+		
+		Args:
+			vector (Vector, VectorArray): argument vector(s)
+		
+		Returns:
+			numpy.array: (N,) array of angles measured in radians
+		"""
+		i,j,k = _components(vector)
+		x,y,z = self.i, self.j, self.k
+
+		n1n2 = np.abs(x*i + y*j + z*k)
+		n1   = np.sqrt(x ** 2 + y ** 2 + z ** 2)
+		n2   = np.sqrt(i ** 2 + j ** 2 + k ** 2)
+
+		return np.arccos(n1n2 / (n1 * n2))
+
+	def rotate_by_vector(self, vector, angle):
+		"""
+		Rotates the vectors around a given vector, or around the corresponding
+		vectors of another array, same as **Vector.rotate_by_vector**
+		
+		Args:
+			vector (Vector, VectorArray): pivot vector(s) to perform rotation about
+			angle (float, numpy.array): angle measured in radians, or (N,) array of angles
+		
+		Returns:
+			VectorArray: rotated vectors
+		"""
+		pivot = vector.unit().numpy()
+		pivot = pivot.T if isinstance(vector, Vector) else pivot
+
+		rotation = _rotation_by_vector(pivot, np.asarray(angle, dtype=float))
+
+		return VectorArray(self._transform(rotation, transpose=False))
+
+	def rotate_by_axis(self, axis, angle):
+		"""
+		Rotates the vectors about a given axis, same as **Vector.rotate_by_axis**
+		
+		Args:
+			axis (str): axis name definition ("x", "y" or "z")
+			angle (float, numpy.array): angle measured in radians, or (N,) array of angles
+		
+		Raises:
+			ValueError: if an invalid axis name is passed
+		
+		Returns:
+			VectorArray: rotated vectors
+		"""
+		rotation = _rotation_by_axis(axis, np.asarray(angle, dtype=float))
+		return VectorArray(self._transform(rotation, transpose=True))
+
+	def _transform(self, rotation, transpose):
+		""" multiplies the row vectors with one or N rotation matrices, or their transposes """
+		rotation = rotation.reshape(-1, 3, 3)
+		if transpose:
+			rotation = np.swapaxes(rotation, 1, 2)
+
+		if len(rotation) == 1:
+			return self.array @ rotation[0]
+
+		return np.einsum("ni,nij->nj", self.array, rotation)
+
+	def rotate(self, by, angle):
+		"""
+		Wrapper function to rotate vectors, transparently using **rotate_by_axis**
+		or **rotate_by_vector**, depending on the arguments given.
+		
+		Args:
+			by (str, Vector, VectorArray): axis definition ("x", "y" or "z") or vector(s) 
+			angle (float, numpy.array): angle measured in radians, or (N,) array of angles
+		
+		Raises:
+			ValueError: if an invalid axis name is passed as argument
+		
+		Returns:
+			VectorArray: rotated vectors
+		"""
+		if type(by) is str:
+			return self.rotate_by_axis(by, angle)
+
+		if type(by) is Vector or type(by) is VectorArray:
+			return self.rotate_by_vector(by, angle)
+
+		raise ValueError("invalid vector rotation arguments")
+
+	def __len__(self):
+		return len(self.array)
+
+	def __getitem__(self, item):
+		if isinstance(item, (int, np.integer)):
+			return Vector(*self.array[item].tolist())
+		return VectorArray(self.array[item])
+
+	def __iter__(self):
+		for i,j,k in self.array.tolist():
+			yield Vector(i,j,k)
+
+	def __repr__(self):
+		return "VectorArray(%d vectors)" % (len(self))
+
+def _components(value):
+	""" x,y,z components of a point, vector, tuple or array of them """
+	if isinstance(value, (PointArray, VectorArray)):
+		array = value.array
+		return array[:,0], array[:,1], array[:,2]
+	return tuple(value)
+
+#
 # cartesian mapping utility class
 #
 class LocalCoordinateSystem():
@@ -767,6 +1198,10 @@ class LocalCoordinateSystem():
 
 		The scaling factor is optional, but useful when the world you are mapping
 		to has a different density than the local cartesian system you are using.
+
+		Note:
+			To transform many points, use **to_world_many** and **to_local_many**,
+			which transform whole arrays of coordinates with a single matrix multiplication.
 	"""
 
 	def __init__(self, origin, x_vector, y_vector, scaling=(1,1)):
@@ -825,6 +1260,13 @@ class LocalCoordinateSystem():
 				[      0,       0, 0,  1]
 			])
 
+		# projection back to local coordinates, same as **to_local**
+		self.inverse = np.array([
+				[xx / pi, xy / pi, xz / pi, -(sx * xx + sy * xy + sz * xz) / pi],
+				[yx / pj, yy / pj, yz / pj, -(sx * yx + sy * yy + sz * yz) / pj],
+				[      0,       0,       0,                                   0],
+				[      0,       0,       0,                                   1]
+			])
 
 	def to_local(self, coords):
 		"""
@@ -883,6 +1325,42 @@ class LocalCoordinateSystem():
 		x,y,z,_ = rmatrix.T[0]
 		return Point(x,y,z)
 
+	def to_local_many(self, coords):
+		"""
+		Same as **to_local**, transforms many world three dimensional coordinates 
+		to local cartesian coordinates at once
+		
+		Args:
+			coords (numpy.array, PointArray): (N,3) array of world coordinates
+		
+		Returns:
+			numpy.array: (N,2) array of the resulting cartesian coordinates in **float**
+		"""
+		if isinstance(coords, PointArray):
+			coords = coords.array
+
+		coords = np.asarray(coords, dtype=float).reshape(-1, 3)
+		return coords @ self.inverse[:2,:3].T + self.inverse[:2,3]
+
+	def to_world_many(self, coords):
+		"""
+		Same as **to_world**, transforms many local cartesian coordinates to three 
+		dimensional world coordinates at once
+		
+		Args:
+			coords (numpy.array): (N,2) array of cartesian **x** and **y** coordinates
+		
+		Returns:
+			numpy.array: (N,3) array of the resulting world coordinates
+
+		Examples:
+			>>> points = transform.to_world_many([ (0,0), (10,10) ])
+			>>> PointArray(points).distance(transform.to_world(0,0))
+			array([0.        , 4.41941738])
+		"""
+		coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+		return coords @ self.matrix[:3,:2].T + self.matrix[:3,3]
+
 	def measure(self, point_from, point_to):
 
 		"""
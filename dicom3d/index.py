@@ -0,0 +1,232 @@
+"""
+Sidecar index of DICOM headers, used to reopen series without parsing their files
+"""
+import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pydicom
+from pydicom.dataset import Dataset as PydicomDataset, FileMetaDataset
+from pydicom.multival import MultiValue
+from pydicom.uid import ExplicitVRLittleEndian, ImplicitVRLittleEndian
+
+INDEX_VERSION = 1
+
+INDEX_FILENAME = ".dicom3d-index.json"
+"""
+Name of index files written in the directory of a series
+"""
+
+INDEXED_ATTRIBUTES = [
+	"SOPInstanceUID", "SeriesInstanceUID", "StudyInstanceUID",
+	"Modality", "SeriesNumber", "InstanceNumber",
+	"ImagePositionPatient", "ImageOrientationPatient",
+	"PixelSpacing", "SliceThickness", "SliceLocation",
+	"Rows", "Columns", "SamplesPerPixel", "PhotometricInterpretation",
+	"BitsAllocated", "BitsStored", "HighBit", "PixelRepresentation",
+	"RescaleSlope", "RescaleIntercept"
+]
+"""
+Attributes of each dataset kept in the index
+"""
+
+# transfer syntaxes whose pixel data can be read straight from the file
+RAW_SYNTAXES = (ExplicitVRLittleEndian, ImplicitVRLittleEndian)
+
+PIXEL_DATA = 0x7FE00010
+
+def _value(value):
+	""" converts a pydicom value to a JSON value """
+	if isinstance(value, (list, MultiValue)):
+		return [ _value(v) for v in value ]
+	if isinstance(value, int):
+		return int(value)
+	if isinstance(value, float):
+		return float(value)
+	return str(value)
+
+class HeaderIndex():
+	"""
+		Index of the headers of the DICOM files of a series, holding for each file
+		its size, modification time, the attributes needed to build the series geometry
+		(see **INDEXED_ATTRIBUTES**) and the location of its pixel data.
+
+		Args:
+			path (str): path of the index file, read if it exists
+			base (str): directory the indexed file names are relative to
+
+		Note:
+			Datasets built from the index hold no pixel data. For uncompressed little
+			endian files the pixel data is later read straight from its offset in the
+			file, otherwise the file is decoded by pydicom.
+
+		Examples:
+			>>> index = HeaderIndex.open("/data/series01")
+			>>> datasets = index.read(files)   # only new or changed files are parsed
+			>>> index.save()
+	"""
+
+	def __init__(self, path, base):
+		self.path    = path
+		self.base    = base
+		self.entries = {}
+		self.changed = False
+
+		try:
+			with open(path) as index_file:
+				content = json.load(index_file)
+			if content.get("version") == INDEX_VERSION:
+				self.entries = content.get("files", {})
+		except (OSError, ValueError):
+			self.changed = True
+
+	@staticmethod
+	def open(directory, cache_dir=None):
+		"""
+		Opens the index of a series directory
+
+		Args:
+			directory (str): directory of the series
+			cache_dir (str, optional): directory to keep the index in, instead of the
+				series directory
+
+		Returns:
+			HeaderIndex: the index, empty if not written yet
+		"""
+		directory = os.path.abspath(directory)
+		if cache_dir is None:
+			return HeaderIndex(os.path.join(directory, INDEX_FILENAME), directory)
+
+		cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+		os.makedirs(cache_dir, exist_ok=True)
+
+		name = hashlib.sha1(directory.encode()).hexdigest()
+		return HeaderIndex(os.path.join(cache_dir, "index-%s.json" % (name)), directory)
+
+	def read(self, files, workers=None):
+		"""
+		Builds header-only datasets for the given files, from the index for files that
+		did not change since they were indexed, by parsing the others
+
+		Args:
+			files (list): paths of the DICOM files
+			workers (int, optional): number of threads parsing files, defaults to 1
+
+		Returns:
+			list: **pydicom.dataset.Dataset** objects, in the order of **files**
+		"""
+		names   = [ os.path.relpath(os.path.abspath(filename), self.base) for filename in files ]
+		stats   = [ os.stat(filename) for filename in files ]
+		missing = [ idx for idx, (name, stat) in enumerate(zip(names, stats))
+						if not self._valid(self.entries.get(name), stat) ]
+
+		def parse(idx):
+			return self._entry(files[idx], stats[idx])
+
+		workers = max(1, workers or 1)
+
+		if workers == 1 or len(missing) < 2:
+			parsed = [ parse(idx) for idx in missing ]
+		else:
+			with ThreadPoolExecutor(max_workers=workers) as executor:
+				parsed = list(executor.map(parse, missing))
+
+		for idx, entry in zip(missing, parsed):
+			self.entries[names[idx]] = entry
+
+		# forget files that are gone
+		if len(missing) > 0 or len(self.entries) != len(names):
+			self.entries = { name: self.entries[name] for name in names }
+			self.changed = True
+
+		return [ self._dataset(filename, self.entries[name])
+					for filename, name in zip(files, names) ]
+
+	def save(self):
+		"""
+		Writes the index if it changed. Write errors, such as a read-only series
+		directory, are ignored as the index is only an optimization.
+
+		Returns:
+			bool: **True** if the index was written
+		"""
+		if not self.changed:
+			return False
+
+		temporary = "%s.%d.tmp" % (self.path, os.getpid())
+		try:
+			with open(temporary, "w") as index_file:
+				json.dump({ "version": INDEX_VERSION, "files": self.entries }, index_file)
+			os.replace(temporary, self.path)
+		except OSError:
+			return False
+
+		self.changed = False
+		return True
+
+	@staticmethod
+	def _valid(entry, stat):
+		return entry is not None and \
+			   entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns
+
+	@staticmethod
+	def _entry(filename, stat):
+		""" parses the header of a file into an index entry """
+		dataset = pydicom.dcmread(filename, defer_size=1024)
+
+		attributes = { keyword: _value(dataset.get(keyword))
+						for keyword in INDEXED_ATTRIBUTES if dataset.get(keyword) is not None }
+
+		syntax = str(dataset.file_meta.TransferSyntaxUID) if "TransferSyntaxUID" in dataset.file_meta else None
+
+		return {
+			"size"      : stat.st_size,
+			"mtime"     : stat.st_mtime_ns,
+			"syntax"    : syntax,
+			"attributes": attributes,
+			"pixels"    : HeaderIndex._pixel_location(dataset, syntax)
+		}
+
+	@staticmethod
+	def _pixel_location(dataset, syntax):
+		""" offset and length of pixel data that can be read without decoding, or None """
+		if syntax not in RAW_SYNTAXES or PIXEL_DATA not in dataset:
+			return None
+
+		# stored bits are the lowest ones, see **Dataset.read_pixels**
+		bits = dataset.get("BitsStored")
+		if dataset.get("SamplesPerPixel", 1) != 1 or \
+		   dataset.get("BitsAllocated") not in (8, 16, 32) or \
+		   bits is None or not 0 < bits <= dataset.BitsAllocated or \
+		   dataset.get("HighBit", bits - 1) != bits - 1:
+			return None
+
+		try:
+			element = dataset.get_item(PIXEL_DATA, keep_deferred=True)
+		except TypeError:
+			element = dataset.get_item(PIXEL_DATA)
+
+		offset = getattr(element, "value_tell", None)
+		length = dataset.Rows * dataset.Columns * dataset.BitsAllocated // 8
+		if offset is None or element.length != length:
+			return None
+
+		return [ offset, length ]
+
+	@staticmethod
+	def _dataset(filename, entry):
+		""" builds a header-only dataset from an index entry """
+		dataset = PydicomDataset()
+		dataset.file_meta = FileMetaDataset()
+		if entry["syntax"] is not None:
+			dataset.file_meta.TransferSyntaxUID = entry["syntax"]
+
+		for keyword, value in entry["attributes"].items():
+			setattr(dataset, keyword, value)
+
+		dataset.filename = filename
+		if entry["pixels"] is not None:
+			dataset.pixel_location = tuple(entry["pixels"])
+
+		return dataset
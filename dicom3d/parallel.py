@@ -0,0 +1,197 @@
+"""
+Parallel rendering of sections on a pool of worker processes
+"""
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# internal
+from .render import render_sections, image_dtype, MEMORY_BUDGET
+from .section import Section
+
+# volume shared with the current worker process
+_worker = {}
+
+def _attach(name):
+	""" attaches to an existing shared memory block, leaving its lifetime to the creator """
+	try:
+		return shared_memory.SharedMemory(name=name, track=False)
+	except TypeError:
+		pass
+
+	# before python 3.13 attaching always registers the block to the resource tracker,
+	# see the note of ParallelRenderer
+	return shared_memory.SharedMemory(name=name)
+
+def _initialize(name, shape, dtype, geometry):
+	""" worker initializer: maps the shared volume without copying it """
+	memory = _attach(name)
+
+	_worker["memory"]   = memory
+	_worker["volume"]   = np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+	_worker["geometry"] = geometry
+
+def _render(task):
+	""" worker task: renders a chunk of sections straight into the shared output """
+	name, images_shape, dtype, first, matrices, interpolation, memory_budget, rescale = task
+
+	memory = _attach(name)
+	try:
+		images = np.ndarray(images_shape, dtype=dtype, buffer=memory.buf)
+
+		render_sections(
+			matrices,
+			_worker["geometry"],
+			_worker["volume"],
+			images_shape[1:],
+			dtype=dtype,
+			interpolation=interpolation,
+			memory_budget=memory_budget,
+			out=images[first:first + len(matrices)],
+			rescale=rescale)
+
+		del images
+	finally:
+		memory.close()
+
+	return first
+
+class ParallelRenderer():
+	"""
+		Renders sections of a series on a pool of worker processes.
+
+		The volume built by **Series.cache** is copied once into a shared memory
+		block that all workers map, so neither the volume nor the pydicom datasets
+		are pickled. Only the transformation matrices of the sections are sent to
+		the workers, which write the images into a shared output array.
+
+		Args:
+			series (Series): a homogeneous **dicom3d.Series** object
+			processes (int, optional): number of worker processes, defaults to the number of CPUs
+			memory_budget (int, optional): bytes available to each worker for intermediate arrays
+
+		Important:
+			The renderer holds operating system resources, close it when done or use
+			it as a context manager
+
+		Note:
+			The shared memory blocks are created, tracked and unlinked by the renderer's
+			process. From Python 3.13 workers attach to them untracked. Before 3.13,
+			attaching registers a block to the resource tracker of the process, which
+			unlinks it when that process exits: this is safe only because the pool
+			workers are started by the renderer and share its resource tracker, where
+			the blocks are already registered. Do not attach to the blocks from
+			unrelated processes on these Python versions.
+
+		Examples:
+			>>> with ParallelRenderer(series, processes=8) as renderer:
+			>>>		images = renderer.render(sections, (512,512))
+			>>> images.shape
+			(300, 512, 512)
+	"""
+
+	def __init__(self, series, processes=None, memory_budget=MEMORY_BUDGET):
+		self.series        = series
+		self.processes     = processes or multiprocessing.cpu_count()
+		self.memory_budget = memory_budget
+
+		volume   = series.cache()
+		geometry = series.volume_geometry()
+
+		# copy the volume into shared memory
+		self.memory = shared_memory.SharedMemory(create=True, size=max(1, volume.nbytes))
+		self.volume = np.ndarray(volume.shape, dtype=volume.dtype, buffer=self.memory.buf)
+		self.volume[...] = volume
+
+		self.pool = multiprocessing.Pool(
+			self.processes,
+			initializer=_initialize,
+			initargs=(self.memory.name, volume.shape, volume.dtype.str, geometry))
+
+	def render(self, sections, size, interpolation="nearest", dtype=None, chunk=None, rescale=False):
+		"""
+		Renders the images of the given sections, in parallel
+
+		Args:
+			sections (list): **dicom3d.Section** objects built over the renderer's series
+			size (tuple): tuple of float or integer width,height values, same as for **Section.image**
+			interpolation (str, optional): "nearest", "trilinear" or "cubic", defaults to "nearest"
+			dtype (numpy.dtype, optional): image type, same as for **Section.image**
+			chunk (int, optional): number of sections per worker task, by default the
+				sections are split in about four tasks per worker
+			rescale (bool, optional): converts samples to output units, same as for **Section.image**
+
+		Raises:
+			ValueError: when sections have different image sizes or belong to another series
+
+		Returns:
+			numpy.array: (sections, lines, width) stacked images, in the order of **sections**
+		"""
+		if self.pool is None:
+			raise ValueError("renderer is closed")
+
+		if any(section.series is not self.series for section in sections):
+			raise ValueError("all sections must belong to the renderer's series")
+
+		lines, width = Section._common_shape(sections, size)
+		rescaling = self.series.rescale() if rescale else None
+		dtype  = image_dtype(self.volume, dtype, rescaling)
+		images = np.zeros((len(sections), lines, width), dtype=dtype)
+
+		if images.size == 0:
+			return images
+
+		matrices = np.array([ section.transform.matrix for section in sections ])
+
+		if chunk is None:
+			chunk = max(1, -(-len(sections) // (self.processes * 4)))
+
+		output = shared_memory.SharedMemory(create=True, size=images.nbytes)
+		try:
+			tasks = [ (output.name, images.shape, dtype.str, first,
+						matrices[first:first + chunk], interpolation, self.memory_budget, rescaling)
+							for first in range(0, len(sections), chunk) ]
+
+			self.pool.map(_render, tasks)
+
+			images[...] = np.ndarray(images.shape, dtype=dtype, buffer=output.buf)
+		finally:
+			output.close()
+			output.unlink()
+
+		return images
+
+	def batch(self, planes, origins, size, interpolation="nearest", dtype=None, orientation=True,
+			  rescale=False):
+		"""
+		Same as **Section.batch**, constructs sections from pairs of planes and origins
+		and renders their images in parallel
+
+		Returns:
+			numpy.array: (sections, lines, width) stacked images of the sections
+		"""
+		sections = Section._from_planes(self.series, planes, origins, orientation)
+
+		return self.render(sections, size, interpolation, dtype, rescale=rescale)
+
+	def close(self):
+		"""
+		Stops the worker processes and releases the shared volume
+		"""
+		if self.pool is None:
+			return
+
+		self.pool.close()
+		self.pool.join()
+		self.pool = None
+
+		del self.volume
+		self.memory.close()
+		self.memory.unlink()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
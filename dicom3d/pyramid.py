@@ -0,0 +1,161 @@
+"""
+Multi-resolution copies of the volume of a series, used to render previews
+"""
+import numpy as np
+
+# internal
+from .render import VolumeGeometry, _fit
+
+class VolumePyramid():
+	"""
+		Downsampled copies of the volume built by **Series.cache**, at 2x, 4x, 8x..
+		coarser pixel spacing. Attach one to a series to have sections with a coarse
+		pixel spacing, such as thumbnails and previews, sampled from a smaller volume.
+
+		Args:
+			series (Series): a homogeneous **dicom3d.Series** object
+			levels (int, optional): number of downsampled levels, defaults to 3 (8x)
+
+		Note:
+			Levels are built on first use, each one from the previous level, by
+			averaging blocks of 2x2 pixels. Slices are averaged too, in pairs, once the
+			slice thickness gets below the pixel spacing of the level, unless the series
+			rescales its slices differently.
+
+		Examples:
+			>>> series.pyramid = VolumePyramid(series, levels=3)
+			>>> section.pixel_spacing = (2.8, 2.8)  # 4x the series pixel spacing
+			>>> preview = section.image((128,128))  # sampled from the 4x level
+	"""
+
+	def __init__(self, series, levels=3):
+		self.series = series
+		self.levels = int(levels)
+		self.volumes = {}
+
+	def factors(self, level):
+		"""
+		Returns the downsampling factors of a level, relative to the series volume
+
+		Args:
+			level (int): pyramid level, 0 being the series volume
+
+		Returns:
+			tuple: (slices, pixels) factors, the latter applying to both rows and columns
+		"""
+		pixels = 2 ** level
+		geometry = self.series.volume_geometry()
+
+		slopes, intercepts = self.series.rescale()
+		if np.ptp(slopes) > 0 or np.ptp(intercepts) > 0:
+			return 1, pixels
+
+		# keep slices no thicker than the pixel spacing of the level
+		spacing = min(geometry.scaling) * pixels
+		slices  = 1
+		while slices < pixels and geometry.mapping[2] * slices * 2 <= spacing:
+			slices *= 2
+
+		return slices, pixels
+
+	def level(self, level):
+		"""
+		Returns the geometry and volume of a pyramid level, building it if needed
+
+		Args:
+			level (int): pyramid level, from 0 (series volume) to **levels**
+
+		Raises:
+			ValueError: when the level is out of range
+
+		Returns:
+			tuple: (geometry, volume) pair of **VolumeGeometry** and numpy array
+		"""
+		if level < 0 or level > self.levels:
+			raise ValueError("pyramid level %d out of range, expected 0 to %d" % (
+				level, self.levels))
+
+		if level == 0:
+			return self.series.volume_geometry(), self.series.cache()
+
+		if level in self.volumes:
+			return self.volumes[level]
+
+		geometry, volume = self.level(level - 1)
+		slices = self.factors(level)[0] // self.factors(level - 1)[0]
+
+		start_z, end_z, thick = geometry.mapping
+		scale_x, scale_y = geometry.scaling
+
+		self.volumes[level] = (
+			VolumeGeometry(
+				geometry.origins[::slices],
+				geometry.x_vector,
+				geometry.y_vector,
+				(scale_x * 2, scale_y * 2),
+				(start_z, end_z, thick * slices),
+				(-(-volume.shape[0] // slices), -(-volume.shape[1] // 2), -(-volume.shape[2] // 2))),
+			_downsample(volume, slices, 2))
+
+		return self.volumes[level]
+
+	def select(self, pixel_spacing):
+		"""
+		Selects the coarsest level whose pixel spacing does not exceed the given one
+
+		Args:
+			pixel_spacing (tuple): X and Y pixel spacing of a section, in millimeters
+
+		Returns:
+			int: pyramid level
+		"""
+		spacing = min(self.series.volume_geometry().scaling)
+		ratio   = min(pixel_spacing) / spacing
+
+		level = 0
+		while level < self.levels and 2 ** (level + 1) <= ratio * (1 + 1.e-6):
+			level += 1
+
+		return level
+
+	def source(self, pixel_spacing, rescale=False):
+		"""
+		Returns what to sample to render a section with the given pixel spacing
+
+		Args:
+			pixel_spacing (tuple): X and Y pixel spacing of a section, in millimeters
+			rescale (bool, optional): whether samples are rescaled to output units
+
+		Returns:
+			tuple: (geometry, volume, rescaling) of the selected level, see **Series.sampling**
+		"""
+		level = self.select(pixel_spacing)
+		geometry, volume = self.level(level)
+
+		rescaling = None
+		if rescale:
+			slopes, intercepts = self.series.rescale()
+			slices = self.factors(level)[0]
+			rescaling = (slopes[::slices], intercepts[::slices])
+
+		return geometry, volume, rescaling
+
+def _downsample(volume, slices, pixels):
+	""" averages blocks of slices x pixels x pixels voxels, repeating the edges of partial blocks """
+	count, rows, columns = volume.shape
+
+	pad_rows, pad_columns = -rows % pixels, -columns % pixels
+	out_rows, out_columns = (rows + pad_rows) // pixels, (columns + pad_columns) // pixels
+
+	result = np.empty((-(-count // slices), out_rows, out_columns), dtype=volume.dtype)
+
+	# one block of slices at a time, to keep the float copy small
+	for index in range(0, len(result)):
+		block = volume[index * slices:(index + 1) * slices]
+		block = np.concatenate([ block ] + [ block[-1:] ] * (slices - len(block)))
+		block = np.pad(block, ((0, 0), (0, pad_rows), (0, pad_columns)), mode="edge")
+
+		block = block.reshape(slices, out_rows, pixels, out_columns, pixels)
+		result[index] = _fit(block.mean(axis=(0, 2, 4)), result.dtype)
+
+	return result
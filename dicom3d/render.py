@@ -0,0 +1,977 @@
+"""
+Vectorized rendering engine used by **dicom3d.Section** to sample the cached
+volume of a series
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+def slice_normal(x_vector, y_vector):
+	"""
+	Calculates the direction slices are stacked along, normal to their X and Y axes
+
+	Note:
+		The normal is oriented so that its largest component is positive, that is
+		+Z for axial slices, so that slices sorted along it keep their order on
+		the world axis closest to it
+
+	Args:
+		x_vector (tuple): X axis of the slices
+		y_vector (tuple): Y axis of the slices
+
+	Returns:
+		numpy.array: unit normal vector
+	"""
+	normal = np.cross(np.asarray(x_vector, dtype=float), np.asarray(y_vector, dtype=float))
+	normal = normal / np.linalg.norm(normal)
+
+	return -normal if normal[np.argmax(np.abs(normal))] < 0 else normal
+
+class VolumeGeometry():
+	"""
+		Describes how the three-dimensional array returned by **Series.cache**
+		is laid out in world coordinates. It holds only numpy arrays and plain
+		values, so it is cheap to copy and to send to other processes.
+
+		Args:
+			origins (numpy.array): (slices,3) array of each slice's *ImagePositionPatient*
+			x_vector (numpy.array): unit vector of the slices X axis
+			y_vector (numpy.array): unit vector of the slices Y axis
+			scaling (tuple): pixel spacing on the X and Y axes
+			mapping (tuple): (start_z, end_z, thickness) mapping of the series along
+				the direction its slices are stacked, see **depth**
+			shape (tuple): (slices, rows, columns) shape of the volume
+
+		Note:
+			Slices may be stacked along any direction, such as for sagittal or coronal
+			acquisitions, or sheared, such as for gantry tilted CT scans. The *affine*
+			attribute holds the 4x4 matrix mapping (slice, row, column) voxel coordinates
+			to world coordinates, and *inverse* its inverse.
+	"""
+
+	def __init__(self, origins, x_vector, y_vector, scaling, mapping, shape):
+		self.origins  = np.asarray(origins, dtype=float)
+		self.x_vector = np.asarray(x_vector, dtype=float)
+		self.y_vector = np.asarray(y_vector, dtype=float)
+		self.scaling  = (float(scaling[0]), float(scaling[1]))
+		self.mapping  = tuple(float(v) for v in mapping)
+		self.shape    = tuple(int(v) for v in shape)
+		self.normal   = slice_normal(self.x_vector, self.y_vector)
+
+		# world offset from one slice to the next
+		if len(self.origins) > 1:
+			self.step = (self.origins[-1] - self.origins[0]) / (len(self.origins) - 1)
+		else:
+			self.step = self.normal * self.mapping[2]
+
+		self.affine = np.identity(4)
+		self.affine[:3,0] = self.step
+		self.affine[:3,1] = self.y_vector * self.scaling[1]
+		self.affine[:3,2] = self.x_vector * self.scaling[0]
+		self.affine[:3,3] = self.origins[0]
+
+		self.inverse = np.linalg.inv(self.affine)
+
+	@staticmethod
+	def from_series(series):
+		"""
+		Builds the volume geometry of a homogeneous series
+
+		Args:
+			series (Series): a **dicom3d.Series** object
+
+		Returns:
+			VolumeGeometry: geometry of the series volume
+		"""
+		series._ensure_homogeneity()
+
+		first   = series.first()
+		origins = series.series_geometry.positions
+
+		return VolumeGeometry(
+			origins,
+			first.transform.x_vector.tuple(),
+			first.transform.y_vector.tuple(),
+			first.transform.scaling,
+			series.mapping,
+			(series.count(), first.Rows, first.Columns))
+
+	def layout(self):
+		"""
+		Returns the layout of the volume: its shape, pixel spacing, slice thickness
+		and orientation, not related to the patient position
+
+		Returns:
+			dict: shape, scaling, thickness, x_vector and y_vector values
+		"""
+		return {
+			"shape"    : self.shape,
+			"scaling"  : np.array(self.scaling),
+			"thickness": np.array(self.mapping[2]),
+			"x_vector" : self.x_vector.copy(),
+			"y_vector" : self.y_vector.copy()
+		}
+
+	def depth(self, points):
+		"""
+		Locates world coordinates along the direction slices are stacked, the Z
+		coordinate for axial slices
+
+		Args:
+			points (numpy.array): (...,3) array of world coordinates
+
+		Returns:
+			numpy.array: distance of the points from the world origin along the slices normal
+		"""
+		nx, ny, nz = self.normal
+		if nx == 0 and ny == 0 and nz == 1:
+			return points[...,2]
+
+		return points[...,0] * nx + points[...,1] * ny + points[...,2] * nz
+
+	def slice_index(self, z):
+		"""
+		Vectorized equivalent of **Series.at_z**, maps locations along the stacked
+		slices to slice indexes
+
+		Args:
+			z (numpy.array): locations along the slices normal, see **depth**
+
+		Returns:
+			tuple: (index, inside) arrays, where *inside* flags coordinates
+			located within the Z bounds of the volume
+		"""
+		start_z, end_z, thick = self.mapping
+
+		# locations of the slices themselves come with rounding errors
+		position = (z - start_z) / thick + 1.e-6
+
+		inside = (position >= 0) & (z < end_z)
+		index  = np.floor(position).astype(np.intp)
+		np.clip(index, 0, self.shape[0] - 1, out=index)
+
+		return index, inside
+
+	def to_pixel(self, points, index):
+		"""
+		Vectorized equivalent of **Dataset.to_pixel**, maps world coordinates
+		to the local pixel coordinates of the given slices
+
+		Args:
+			points (numpy.array): (...,3) array of world coordinates
+			index (numpy.array): slice indexes of the points
+
+		Returns:
+			tuple: (x, y) arrays of truncated pixel coordinates
+		"""
+		x, y = self._project(points, index)
+		return np.trunc(x).astype(np.intp), np.trunc(y).astype(np.intp)
+
+	def to_voxel(self, points):
+		"""
+		Maps world coordinates to continuous voxel coordinates of the volume
+
+		Note:
+			Voxel (k,j,i) covers the [k,k+1) x [j,j+1) x [i,i+1) range, the same
+			range that **to_pixel** and **slice_index** truncate to that voxel,
+			so its center is located at (k+0.5, j+0.5, i+0.5)
+
+			The mapping is the inverse of the *affine* matrix, worked out along the
+			slices normal first, then in the plane of the slices
+
+		Args:
+			points (numpy.array): (...,3) array of world coordinates
+
+		Returns:
+			tuple: (z, y, x) arrays of voxel coordinates
+		"""
+		start_z, _, thick = self.mapping
+		xv, yv = self.x_vector, self.y_vector
+		dx, dy = self.scaling
+
+		z = (self.depth(points) - start_z) / thick
+
+		# translate to the origin of the slice through each point, one component at a time
+		d = [ points[...,axis] - self.origins[0,axis] - z * self.step[axis] for axis in range(0, 3) ]
+
+		x = (d[0] * xv[0] + d[1] * xv[1] + d[2] * xv[2]) / dx
+		y = (d[0] * yv[0] + d[1] * yv[1] + d[2] * yv[2]) / dy
+		return z, y, x
+
+	def world_to_voxel(self, points):
+		"""
+		Maps world coordinates to continuous voxel coordinates, see **to_voxel**
+
+		Args:
+			points (numpy.array): (...,3) array of world coordinates
+
+		Returns:
+			numpy.array: (...,3) array of (slice, row, column) voxel coordinates
+		"""
+		return np.stack(self.to_voxel(np.asarray(points, dtype=float)), axis=-1)
+
+	def voxel_to_world(self, voxels):
+		"""
+		Maps continuous voxel coordinates to world coordinates, through the *affine* matrix
+
+		Args:
+			voxels (numpy.array): (...,3) array of (slice, row, column) voxel coordinates
+
+		Returns:
+			numpy.array: (...,3) array of world coordinates
+		"""
+		voxels = np.asarray(voxels, dtype=float)
+		return voxels @ self.affine[:3,:3].T + self.affine[:3,3]
+
+	def _project(self, points, index):
+		""" projects points on the X and Y axes of the given slices, in pixels """
+		xv, yv = self.x_vector, self.y_vector
+		dx, dy = self.scaling
+
+		# translate to the origin of each slice, one component at a time
+		d = [ points[...,axis] - self.origins[:,axis][index] for axis in range(0, 3) ]
+
+		x = (d[0] * xv[0] + d[1] * xv[1] + d[2] * xv[2]) / dx
+		y = (d[0] * yv[0] + d[1] * yv[1] + d[2] * yv[2]) / dy
+		return x, y
+
+def _linear_weights(t):
+	""" linear interpolation taps and weights for fractional offsets *t* """
+	return (0, 1), (1 - t, t)
+
+def _cubic_weights(t, a=-0.5):
+	""" Keys cubic convolution taps and weights for fractional offsets *t* """
+	t2, t3 = t * t, t * t * t
+	return (-1, 0, 1, 2), (
+		a * t3 - 2 * a * t2 + a * t,
+		(a + 2) * t3 - (a + 3) * t2 + 1,
+		-(a + 2) * t3 + (2 * a + 3) * t2 - a * t,
+		-a * t3 + a * t2 )
+
+INTERPOLATIONS = {
+	"nearest"  : None,
+	"trilinear": _linear_weights,
+	"cubic"    : _cubic_weights
+}
+"""
+Interpolation modes supported when sampling a volume
+"""
+
+def check_interpolation(interpolation):
+	"""
+	Verifies that an interpolation mode is supported
+
+	Args:
+		interpolation (str): interpolation mode
+
+	Raises:
+		ValueError: when the mode is not one of **INTERPOLATIONS**
+	"""
+	if interpolation not in INTERPOLATIONS:
+		raise ValueError("unknown interpolation '%s', expected one of: %s" % (
+			interpolation, ", ".join(INTERPOLATIONS)))
+
+def section_grid(transform, shape, lines=None):
+	"""
+	Calculates the world coordinates of every sample of a section image
+
+	Note:
+		Each line is walked from its left end by a constant increment, the same
+		way **Section** always did, so that the resulting coordinates are
+		identical to the ones of the per-pixel implementation. The grid has one
+		extra column holding the position following the last sample of each line.
+
+	Args:
+		transform (LocalCoordinateSystem, numpy.array): the section's coordinate system, 
+			or a (lines,4,4) array holding the transformation matrix of each line
+		shape (tuple): (lines, width) of the section image in pixels
+		lines (numpy.array, optional): line numbers to calculate, defaults to all lines
+
+	Returns:
+		numpy.array: (lines, width+1, 3) array of world coordinates
+	"""
+	height, width = shape
+	ox, oy = -width//2, -height//2
+
+	if lines is None:
+		lines = np.arange(0, height)
+
+	matrix = getattr(transform, "matrix", transform)
+
+	# left and right ends of each line, as local (x, y, 0, 1) coordinates
+	ends = np.zeros((2, len(lines), 4, 1))
+	ends[0,:,0,0] = 0 + ox
+	ends[1,:,0,0] = width + ox
+	ends[:,:,1,0] = lines + oy
+	ends[:,:,3,0] = 1
+
+	start, end = np.matmul(matrix, ends)[:,:,:3,0]
+
+	grid = np.empty((len(lines), width + 1, 3))
+	grid[:, 0 ] = start
+	grid[:, 1:] = ((end - start) / width)[:,None,:]
+
+	return np.cumsum(grid, axis=1, out=grid)
+
+def nearest_taps(geometry, grid):
+	"""
+	Calculates the voxels read by nearest-neighbour sampling of a section grid
+
+	Args:
+		geometry (VolumeGeometry): geometry of the volume
+		grid (numpy.array): (lines, width+1, 3) grid built by **section_grid**
+
+	Returns:
+		tuple: (valid, taps) where *valid* flags the (lines, width) samples located
+		inside the volume and *taps* holds the (indexes, weights) pair of each axis, 
+		see **gather**
+	"""
+	_, rows, columns = geometry.shape
+
+	# lines starting outside the Z bounds are left empty, then each sample
+	# reads from the slice intersecting the position that follows it
+	index, inside = geometry.slice_index(geometry.depth(grid))
+	x, y = geometry.to_pixel(grid[:,:-1], index[:,:-1])
+
+	valid = inside[:,1:] & inside[:,:1] & \
+			(x >= 0) & (x < columns) & \
+			(y >= 0) & (y < rows)
+
+	taps = [ (axis[valid][None], None) for axis in (index[:,1:], y, x) ]
+	return valid, taps
+
+def interpolated_taps(geometry, points, interpolation):
+	"""
+	Calculates the voxels and weights used by trilinear or cubic sampling of points
+
+	Note:
+		Samples located outside the volume are left untouched, same as with
+		nearest-neighbour sampling. Inside the volume, interpolation taps
+		falling over the edges are clamped to the edge voxels.
+
+	Args:
+		geometry (VolumeGeometry): geometry of the volume
+		points (numpy.array): (...,3) array of world coordinates
+		interpolation (str): "trilinear" or "cubic"
+
+	Returns:
+		tuple: (valid, taps) where *valid* flags the points located inside the 
+		volume and *taps* holds the (indexes, weights) pair of each axis, see **gather**
+	"""
+	weights = INTERPOLATIONS[interpolation]
+
+	z, y, x = geometry.to_voxel(points)
+
+	valid = (z >= 0) & (z < geometry.shape[0]) & \
+			(y >= 0) & (y < geometry.shape[1]) & \
+			(x >= 0) & (x < geometry.shape[2])
+
+	# taps and weights on each axis, relative to voxel centers
+	taps = []
+	for coords, size in zip((z[valid], y[valid], x[valid]), geometry.shape):
+		coords = coords - 0.5
+		base   = np.floor(coords)
+		offsets, tap_weights = weights(coords - base)
+
+		base = base.astype(np.intp)
+		taps.append((
+			np.array([ np.clip(base + offset, 0, size - 1) for offset in offsets ]),
+			np.array(tap_weights) ))
+
+	return valid, taps
+
+def image_dtype(volume, dtype=None, rescale=None):
+	"""
+	Resolves the type of rendered images: the requested type, or the volume's
+	type, or **float32** when samples are rescaled
+
+	Args:
+		volume (numpy.array): volume array
+		dtype (numpy.dtype, optional): requested image type
+		rescale (tuple, optional): rescaling of the samples, see **gather**
+
+	Returns:
+		numpy.dtype: image type
+	"""
+	if dtype is not None:
+		return np.dtype(dtype)
+	return volume.dtype if rescale is None else np.dtype(np.float32)
+
+def _fit(samples, dtype):
+	""" rounds float samples and clips samples to the range of an integer image type """
+	if not np.issubdtype(dtype, np.integer):
+		return samples
+
+	info = np.iinfo(dtype)
+	if samples.dtype.kind == "f":
+		return np.clip(np.rint(samples), info.min, info.max)
+
+	# narrower integer types would wrap around
+	if not np.can_cast(samples.dtype, dtype):
+		return np.clip(samples, info.min, info.max)
+
+	return samples
+
+def gather(volume, valid, taps, out, rescale=None):
+	"""
+	Reads and combines the voxels of the given taps into the valid samples of **out**
+
+	Args:
+		volume (numpy.array): (slices, rows, columns) volume array
+		valid (numpy.array): boolean mask of the samples of **out** to set
+		taps (list): (indexes, weights) pairs for the Z, Y and X axes, each holding
+			a (taps, samples) array of voxel indexes and one of weights, or 
+			**None** weights for nearest-neighbour sampling
+		out (numpy.array): array to store samples into
+		rescale (tuple, optional): (slopes, intercepts) arrays holding the linear
+			rescaling of the stored values of each slice, applied to the voxels 
+			read, see **Series.rescale**
+
+	Returns:
+		numpy.array: the **out** array
+	"""
+	(iz, wz), (iy, wy), (ix, wx) = taps
+
+	_, rows, columns = volume.shape
+	voxels = volume.reshape(-1)
+
+	iz, iy, ix = [ indexes.astype(np.intp, copy=False) for indexes in (iz, iy, ix) ]
+
+	# single tap, read voxels through flat indexes of the volume
+	if wz is None:
+		samples = voxels[(iz[0] * rows + iy[0]) * columns + ix[0]]
+		if rescale is not None:
+			slopes, intercepts = rescale
+			samples = samples * slopes[iz[0]] + intercepts[iz[0]]
+
+		out[valid] = _fit(samples, out.dtype)
+		return out
+
+	samples = np.zeros(iz.shape[1])
+
+	# accumulate weighted taps
+	if rescale is None:
+		for tz in range(0, len(iz)):
+			for ty in range(0, len(iy)):
+				wzy  = wz[tz] * wy[ty]
+				line = (iz[tz] * rows + iy[ty]) * columns
+				for tx in range(0, len(ix)):
+					samples += wzy * wx[tx] * voxels[line + ix[tx]]
+	else:
+		# taps of the same slice share the rescaling, apply it once per slice
+		slopes, intercepts = rescale
+		for tz in range(0, len(iz)):
+			plane = np.zeros(iz.shape[1])
+			for ty in range(0, len(iy)):
+				line = (iz[tz] * rows + iy[ty]) * columns
+				for tx in range(0, len(ix)):
+					plane += wy[ty] * wx[tx] * voxels[line + ix[tx]]
+			samples += wz[tz] * (plane * slopes[iz[tz]] + intercepts[iz[tz]])
+
+	# cubic kernels overshoot, keep samples within the image type range
+	out[valid] = _fit(samples, out.dtype)
+	return out
+
+def sample_taps(geometry, grid, interpolation):
+	""" taps of a section grid for the given interpolation mode """
+	if interpolation == "nearest":
+		return nearest_taps(geometry, grid)
+	return interpolated_taps(geometry, grid[:,:-1], interpolation)
+
+def point_taps(geometry, points, interpolation):
+	"""
+	Calculates the voxels and weights sampled at arbitrary points of the volume
+
+	Note:
+		Unlike **nearest_taps**, which walks the lines of a planar section, 
+		nearest-neighbour sampling of points simply reads the voxel containing 
+		each point
+
+	Args:
+		geometry (VolumeGeometry): geometry of the volume
+		points (numpy.array): (...,3) array of world coordinates
+		interpolation (str): "nearest", "trilinear" or "cubic"
+
+	Returns:
+		tuple: (valid, taps) same as **interpolated_taps**
+	"""
+	if interpolation != "nearest":
+		return interpolated_taps(geometry, points, interpolation)
+
+	z, y, x = geometry.to_voxel(points)
+
+	valid = (z >= 0) & (z < geometry.shape[0]) & \
+			(y >= 0) & (y < geometry.shape[1]) & \
+			(x >= 0) & (x < geometry.shape[2])
+
+	taps = [ (np.floor(coords[valid]).astype(np.intp)[None], None) for coords in (z, y, x) ]
+	return valid, taps
+
+MEMORY_BUDGET = 16 * 1024 * 1024
+"""
+Default amount of memory, in bytes, used for intermediate arrays while rendering
+"""
+
+SAMPLE_BYTES = 256
+"""
+Approximate peak of intermediate memory, in bytes, needed to render one sample
+"""
+
+def _render_blocks(render_block, lines, width, memory_budget, threads):
+	""" 
+	calls *render_block* with slices of the lines to render, sized so that intermediate
+	arrays fit within *memory_budget*, on a pool of threads if more than one 
+	"""
+	threads = max(1, threads or 1)
+	chunk   = max(1, memory_budget // threads // (SAMPLE_BYTES * (width + 1)))
+
+	# several blocks per thread to balance blocks covering fewer samples
+	if threads > 1:
+		chunk = min(chunk, max(1, -(-lines // (threads * 4))))
+
+	blocks = [ slice(first, min(first + chunk, lines)) for first in range(0, lines, chunk) ]
+
+	if threads == 1 or len(blocks) == 1:
+		for block in blocks:
+			render_block(block)
+	else:
+		# blocks write disjoint lines, so the result does not depend on scheduling
+		with ThreadPoolExecutor(max_workers=threads) as executor:
+			for _ in executor.map(render_block, blocks): pass
+
+def render_sections(transforms, geometry, volume, shape, dtype=None,
+					interpolation="nearest", memory_budget=MEMORY_BUDGET, out=None, threads=None,
+					rescale=None):
+	"""
+	Renders the images of many sections of the same size from a cached volume
+
+	Note:
+		The lines of all sections are sampled together, in chunks sized so that 
+		the intermediate arrays fit within **memory_budget** bytes. With more than
+		one thread, the chunks are rendered concurrently, as numpy releases the GIL
+		while sampling.
+
+	Args:
+		transforms (list): **LocalCoordinateSystem** objects of the sections, or
+			their transformation matrices
+		geometry (VolumeGeometry): geometry of the volume
+		volume (numpy.array): (slices, rows, columns) volume array
+		shape (tuple): (lines, width) of each section image in pixels
+		dtype (numpy.dtype, optional): image type, see **image_dtype**
+		interpolation (str, optional): "nearest", "trilinear" or "cubic", defaults to "nearest"
+		memory_budget (int, optional): bytes available for intermediate arrays
+		out (numpy.array, optional): (sections, lines, width) array to render into
+		threads (int, optional): number of threads rendering blocks of lines, defaults to 1
+		rescale (tuple, optional): (slopes, intercepts) rescaling of each slice, see **gather**
+
+	Raises:
+		ValueError: when an unknown interpolation mode is given
+
+	Returns:
+		numpy.array: (sections, lines, width) stacked images of the sections
+	"""
+	check_interpolation(interpolation)
+
+	lines, width = shape
+	dtype = image_dtype(volume, dtype, rescale)
+
+	if out is None:
+		images = np.zeros((len(transforms), lines, width), dtype=dtype)
+	else:
+		images = out
+		images[...] = 0
+
+	if images.size == 0:
+		return images
+
+	matrices = np.array([ getattr(transform, "matrix", transform) 
+							for transform in transforms ])
+
+	# all lines of all sections, one after another
+	flat = images.reshape(-1, width)
+
+	def render_block(block):
+		index = np.arange(block.start, block.stop)
+		grid  = section_grid(matrices[index // lines], shape, index % lines)
+
+		valid, taps = sample_taps(geometry, grid, interpolation)
+		gather(volume, valid, taps, flat[block], rescale)
+
+	_render_blocks(render_block, len(flat), width, memory_budget, threads)
+
+	return images
+
+def render_section(transform, geometry, volume, shape, dtype=None,
+				   interpolation="nearest", memory_budget=MEMORY_BUDGET, threads=None, rescale=None):
+	"""
+	Renders the image of a section from a cached volume
+
+	Args:
+		transform (LocalCoordinateSystem): the section's coordinate system
+		geometry (VolumeGeometry): geometry of the volume
+		volume (numpy.array): (slices, rows, columns) volume array
+		shape (tuple): (lines, width) of the section image in pixels
+		dtype (numpy.dtype, optional): image type, see **image_dtype**
+		interpolation (str, optional): "nearest", "trilinear" or "cubic", defaults to "nearest"
+		memory_budget (int, optional): bytes available for intermediate arrays
+		threads (int, optional): number of threads rendering blocks of lines, defaults to 1
+		rescale (tuple, optional): (slopes, intercepts) rescaling of each slice, see **gather**
+
+	Raises:
+		ValueError: when an unknown interpolation mode is given
+
+	Returns:
+		numpy.array: (lines, width) image of the section
+	"""
+	return render_sections(
+		[transform], geometry, volume, shape, 
+		dtype, interpolation, memory_budget, threads=threads, rescale=rescale)[0]
+
+def render_sweep(matrices, geometry, volume, shape, dtype=None, interpolation="nearest",
+				 memory_budget=MEMORY_BUDGET, threads=None, rescale=None):
+	"""
+	Lazily renders the images of a sequence of sections of the same size, such as
+	the frames of a sweep through the volume
+
+	Note:
+		The image type, sampling mode and rescaling are resolved once for the whole
+		sequence. Each image is built with **section_grid**, the same way as by
+		**render_section**, so that it is identical to the image of that section alone.
+
+	Args:
+		matrices (numpy.array): (sections,4,4) transformation matrices of the sections, 
+			see **LocalCoordinateSystem.matrix**
+		geometry (VolumeGeometry): geometry of the volume
+		volume (numpy.array): (slices, rows, columns) volume array
+		shape (tuple): (lines, width) of each section image in pixels
+		dtype (numpy.dtype, optional): image type, see **image_dtype**
+		interpolation (str, optional): "nearest", "trilinear" or "cubic", defaults to "nearest"
+		memory_budget (int, optional): bytes available for intermediate arrays
+		threads (int, optional): number of threads rendering blocks of lines, defaults to 1
+		rescale (tuple, optional): (slopes, intercepts) rescaling of each slice, see **gather**
+
+	Raises:
+		ValueError: when an unknown interpolation mode is given
+
+	Yields:
+		numpy.array: (lines, width) image of each section, in order
+	"""
+	check_interpolation(interpolation)
+
+	lines, width = shape
+	dtype    = image_dtype(volume, dtype, rescale)
+	matrices = np.asarray(matrices, dtype=float).reshape(-1, 4, 4)
+
+	for matrix in matrices:
+		image = np.zeros((lines, width), dtype=dtype)
+
+		def render_block(block):
+			grid = section_grid(matrix, shape, np.arange(block.start, block.stop))
+			valid, taps = sample_taps(geometry, grid, interpolation)
+			gather(volume, valid, taps, image[block], rescale)
+
+		if image.size > 0:
+			_render_blocks(render_block, lines, width, memory_budget, threads)
+
+		yield image
+
+SLAB_MODES = ("max", "min", "mean")
+"""
+Reductions supported when rendering slabs: maximum (MIP), minimum (MinIP) and average intensity
+"""
+
+def render_points(points, geometry, volume, dtype=None, interpolation="nearest",
+				  memory_budget=MEMORY_BUDGET, rescale=None):
+	"""
+	Renders an image by sampling the volume at arbitrary world coordinates, such as
+	the points of a curved surface
+
+	Args:
+		points (numpy.array): (lines, width, 3) array of world coordinates
+		geometry (VolumeGeometry): geometry of the volume
+		volume (numpy.array): (slices, rows, columns) volume array
+		dtype (numpy.dtype, optional): image type, see **image_dtype**
+		interpolation (str, optional): "nearest", "trilinear" or "cubic", defaults to "nearest"
+		memory_budget (int, optional): bytes available for intermediate arrays
+		rescale (tuple, optional): (slopes, intercepts) rescaling of each slice, see **gather**
+
+	Raises:
+		ValueError: when an unknown interpolation mode is given
+
+	Returns:
+		numpy.array: (lines, width) image
+	"""
+	check_interpolation(interpolation)
+
+	lines, width = points.shape[:2]
+	dtype = image_dtype(volume, dtype, rescale)
+
+	image = np.zeros((lines, width), dtype=dtype)
+	if image.size == 0:
+		return image
+
+	chunk = max(1, memory_budget // (SAMPLE_BYTES * width))
+
+	for first in range(0, lines, chunk):
+		block = slice(first, min(first + chunk, lines))
+		valid, taps = point_taps(geometry, points[block], interpolation)
+		gather(volume, valid, taps, image[block], rescale)
+
+	return image
+
+def render_slab(transform, geometry, volume, shape, thickness, samples=None, mode="max",
+				dtype=None, interpolation="nearest", memory_budget=MEMORY_BUDGET, rescale=None):
+	"""
+	Renders the image of a thick slab centered on a section, by reducing samples 
+	taken along the section's normal
+
+	Note:
+		The slab is rendered in blocks of lines. For each block, the samples of every 
+		offset along the normal are reduced as soon as they are gathered, so that only
+		a block sized copy of the section is kept in memory, whatever the number of 
+		samples. Samples located outside the volume do not take part in the reduction.
+
+	Args:
+		transform (LocalCoordinateSystem): the section's coordinate system
+		geometry (VolumeGeometry): geometry of the volume
+		volume (numpy.array): (slices, rows, columns) volume array
+		shape (tuple): (lines, width) of the section image in pixels
+		thickness (float): slab thickness in millimeters
+		samples (int, optional): number of samples across the slab, by default one
+			for each voxel spacing along the thickness
+		mode (str, optional): "max", "min" or "mean", defaults to "max"
+		dtype (numpy.dtype, optional): image type, see **image_dtype**
+		interpolation (str, optional): "nearest", "trilinear" or "cubic", defaults to "nearest"
+		memory_budget (int, optional): bytes available for intermediate arrays
+		rescale (tuple, optional): (slopes, intercepts) rescaling of each slice, see **gather**
+
+	Raises:
+		ValueError: when an unknown reduction or interpolation mode is given
+
+	Returns:
+		numpy.array: (lines, width) image of the slab
+	"""
+	if mode not in SLAB_MODES:
+		raise ValueError("unknown slab mode '%s', expected one of: %s" % (
+			mode, ", ".join(SLAB_MODES)))
+
+	check_interpolation(interpolation)
+
+	if samples is None:
+		step = min(*geometry.scaling, geometry.mapping[2])
+		samples = int(np.ceil(thickness / step)) + 1
+
+	lines, width = shape
+	dtype = image_dtype(volume, dtype, rescale)
+
+	image = np.zeros((lines, width), dtype=dtype)
+	if image.size == 0:
+		return image
+
+	normal  = np.cross(transform.x_vector.tuple(), transform.y_vector.tuple())
+	normal  = normal / np.linalg.norm(normal)
+	offsets = np.linspace(-thickness/2, thickness/2, samples) if samples > 1 else [ 0.0 ]
+
+	chunk = max(1, memory_budget // (SAMPLE_BYTES * (width + 1)))
+
+	for first in range(0, lines, chunk):
+		index = np.arange(first, min(first + chunk, lines))
+		grid  = section_grid(transform, shape, index)
+
+		initial = { "max": -np.inf, "min": np.inf, "mean": 0 }[mode]
+		reduced = np.full((len(index), width), initial, dtype=float)
+		count   = np.zeros((len(index), width), dtype=np.intp)
+		block   = np.empty((len(index), width))
+
+		for offset in offsets:
+			valid, taps = sample_taps(geometry, grid + offset * normal, interpolation)
+			gather(volume, valid, taps, block, rescale)
+
+			if mode == "max":
+				np.maximum(reduced, block, out=reduced, where=valid)
+			elif mode == "min":
+				np.minimum(reduced, block, out=reduced, where=valid)
+			else:
+				np.add(reduced, block, out=reduced, where=valid)
+
+			count += valid
+
+		if mode == "mean":
+			np.divide(reduced, count, out=reduced, where=count > 0)
+
+		reduced[count == 0] = 0
+		image[index] = _fit(reduced, image.dtype)
+
+	return image
+
+class SamplingPlan():
+	"""
+		Precomputed voxel indexes and interpolation weights for rendering the images
+		of a fixed set of sections.
+
+		A plan depends only on the layout of the volume, not on its values, so it can
+		be built once and applied to the volume of any series acquired with the same
+		protocol (same number of slices, rows, columns, pixel spacing, thickness and
+		orientation). Plans can be saved to disk and loaded by other processes.
+
+		Args:
+			interpolation (str): "nearest", "trilinear" or "cubic"
+			shape (tuple): (sections, lines, width) shape of the rendered images
+			valid (numpy.array): boolean mask of the samples located inside the volume
+			taps (list): (indexes, weights) pairs for the Z, Y and X axes, see **gather**
+			layout (dict): layout of the volume the plan was built for, see **VolumeGeometry.layout**
+
+		Examples:
+			>>> plan = section.plan((512,512), interpolation="trilinear")
+			>>> plan.save("coronal.npz")
+			>>> # later, in another process
+			>>> plan = SamplingPlan.load("coronal.npz")
+			>>> image = plan.apply(other_series)[0]
+	"""
+
+	def __init__(self, interpolation, shape, valid, taps, layout):
+		self.interpolation = interpolation
+		self.shape  = tuple(shape)
+		self.valid  = valid
+		self.taps   = taps
+		self.layout = layout
+
+	@staticmethod
+	def build(transforms, geometry, shape, interpolation="nearest"):
+		"""
+		Builds the sampling plan of sections over a volume
+
+		Args:
+			transforms (list): **LocalCoordinateSystem** objects of the sections, or
+				their transformation matrices
+			geometry (VolumeGeometry): geometry of the volume
+			shape (tuple): (lines, width) of each section image in pixels
+			interpolation (str, optional): "nearest", "trilinear" or "cubic", defaults to "nearest"
+
+		Raises:
+			ValueError: when an unknown interpolation mode is given
+
+		Returns:
+			SamplingPlan: the sampling plan
+		"""
+		check_interpolation(interpolation)
+
+		lines, width = shape
+		count = len(transforms)
+		valid = np.zeros((count, lines, width), dtype=bool)
+		taps  = [ (np.zeros((1,0), dtype=np.intp), None) ] * 3
+
+		if valid.size > 0:
+			matrices = np.array([ getattr(transform, "matrix", transform)
+									for transform in transforms ])
+
+			index = np.arange(0, count * lines)
+			grid  = section_grid(matrices[index // lines], shape, index % lines)
+
+			sample_valid, taps = sample_taps(geometry, grid, interpolation)
+			valid = sample_valid.reshape(valid.shape)
+
+		# voxel indexes fit 32 bits for any practical volume
+		index_type = np.int32 if max(geometry.shape) < 2 ** 31 else np.intp
+		taps = [ (indexes.astype(index_type), weights) for indexes, weights in taps ]
+
+		return SamplingPlan(interpolation, (count, lines, width), valid, taps, geometry.layout())
+
+	def compatible(self, geometry):
+		"""
+		Verifies if the plan can be applied to a volume with the given geometry
+
+		Args:
+			geometry (VolumeGeometry, tuple): geometry of the volume or its (slices, rows, columns) shape
+
+		Returns:
+			bool: **True** if compatible, **False** otherwise
+		"""
+		if type(geometry) is tuple:
+			return geometry == self.layout["shape"]
+
+		layout = geometry.layout()
+		if layout["shape"] != self.layout["shape"]:
+			return False
+
+		return all(np.allclose(layout[name], self.layout[name], atol=1.e-4)
+					for name in ("scaling", "thickness", "x_vector", "y_vector"))
+
+	def apply(self, volume, dtype=None, rescale=False):
+		"""
+		Renders the images of the planned sections from a volume
+
+		Args:
+			volume (Series, numpy.array): a **dicom3d.Series** object or a (slices, rows, columns) volume array
+			dtype (numpy.dtype, optional): image type, see **image_dtype**
+			rescale (bool, optional): rescale samples with the *RescaleSlope* and *RescaleIntercept*
+				of the series, see **Series.rescale**. Defaults to **False**.
+
+		Raises:
+			ValueError: when the volume is not compatible with the plan, or rescaling
+				is requested for a volume array
+
+		Returns:
+			numpy.array: (sections, lines, width) stacked images of the sections
+		"""
+		if hasattr(volume, "volume_geometry"):
+			series = volume
+			geometry, volume = series.volume_geometry(), series.cache()
+			rescale = series.rescale() if rescale else None
+		else:
+			if rescale:
+				raise ValueError("rescaling samples needs a series, not a volume array")
+			geometry, rescale = tuple(volume.shape), None
+
+		if not self.compatible(geometry):
+			raise ValueError("volume is not compatible with the sampling plan, expected %s volume" % (
+				"x".join("%d" % v for v in self.layout["shape"])))
+
+		images = np.zeros(self.shape, dtype=image_dtype(volume, dtype, rescale))
+		return gather(volume, self.valid, self.taps, images, rescale)
+
+	def save(self, path):
+		"""
+		Saves the plan to a **.npz** file
+
+		Args:
+			path (str): path of the file
+		"""
+		arrays = { "valid": self.valid }
+		for axis, (indexes, weights) in zip("zyx", self.taps):
+			arrays["index_" + axis] = indexes
+			if weights is not None:
+				arrays["weight_" + axis] = weights
+
+		np.savez(path,
+			interpolation = self.interpolation,
+			shape = self.shape,
+			**{ "layout_" + name: value for name, value in self.layout.items() },
+			**arrays)
+
+	@staticmethod
+	def load(path):
+		"""
+		Loads a plan saved by **SamplingPlan.save**
+
+		Args:
+			path (str): path of the file
+
+		Returns:
+			SamplingPlan: the loaded plan
+		"""
+		with np.load(path) as data:
+			taps = [ (data["index_" + axis], 
+					  data["weight_" + axis] if "weight_" + axis in data else None)
+						for axis in "zyx" ]
+
+			layout = { name[len("layout_"):]: data[name] 
+						for name in data.files if name.startswith("layout_") }
+			layout["shape"] = tuple(int(v) for v in layout["shape"])
+
+			return SamplingPlan(
+				str(data["interpolation"]),
+				tuple(int(v) for v in data["shape"]),
+				data["valid"],
+				taps,
+				layout)
@@ -4,6 +4,7 @@ import numpy as np
 from .geometry import *
 from .data import walk_data
 from .series import Series
+from .render import render_section, render_sections, render_sweep, render_slab, image_dtype, check_interpolation, SamplingPlan, MEMORY_BUDGET
 
 class Section():
 
@@ -45,10 +46,8 @@ class Section():
 		Returns:
 			Section: constructed section object 
 		"""
-		_,_,oz = origin
-
 		# find dataset that interesects origin
-		dataset = series.at_z(oz)
+		dataset = series.at_z(series.depth(origin))
 		if dataset is None:
 			raise Exception("origin (%s) doesn't intersect any dataset" % (origin))
 
@@ -59,21 +58,26 @@ class Section():
 			y_vector  = dataset.transform.y_vector.copy()
 
 		else:
-			# get interesection points with the given plane
-			points = dataset.plane_intersection(plane)
-			if points is None:
-				raise Exception("dataset at origin does not intersect plane")
+			normal = Vector.from_plane(plane)
+
+			if abs(dataset.normal()[2]) > 1 - 1.e-4:
+				# get interesection points with the given plane
+				points = dataset.plane_intersection(plane)
+				if points is None:
+					raise Exception("dataset at origin does not intersect plane")
 
-			if len(points) != 2:
-				raise Exception("number of intesection points is invalid (%d)" % (len(points)))
+				if len(points) != 2:
+					raise Exception("number of intesection points is invalid (%d)" % (len(points)))
 
-			# select any point from dataset intersection
-			point = points[0]
+				# select any point from dataset intersection
+				point = points[0]
+				x_vector = Vector.from_coords(origin, point).unit()
+			else:
+				# not axial, X axis follows the intersection of the dataset and the plane
+				x_vector = Vector(*np.cross(normal.tuple(), dataset.normal())).unit()
 
 			# construct X and Y axes
 			# Note: Y axis is actually the X vector rotated 90 degrees
-			normal   = Vector.from_plane(plane)
-			x_vector = Vector.from_coords(origin, point).unit()
 			y_vector = x_vector.rotate_by_vector(normal,radians(90))
 
 			# make sure X,Y vector has the same orientation, disregarding slice
@@ -209,53 +213,48 @@ class Section():
 		x,y = self.transform.to_local(coords)
 		return (int(x),int(y))
 
-	def _line(self, image, line_y, offset, max_width):
-
-		ox, oy = offset
-
-		start = self.to_mm(0 + ox, line_y + oy)
-		end   = self.to_mm(max_width + ox, line_y + oy)
-
-		sx,sy,sz = start
-		ex,ey,ez = end
-		ix,iy,iz = (ex-sx)/max_width, (ey-sy)/max_width,(ez-sz)/max_width
-
-		dataset = self.series.at_z(sz)
-		if dataset is None:
-			return
-
-		pixarr  = dataset.pixel_array
-		line_array = image[line_y]
-
-		for i in range(0,max_width):
-
-			x, y = dataset.to_pixel((sx,sy,sz))
-
-			# next pixel
-			sx, sy, sz = sx + ix, sy + iy, sz + iz
-
-			# out of range
-			if x < 0 or x >= dataset.Columns: continue
-			if y < 0 or y >= dataset.Rows   : continue
-
-			if dataset.intersects_z(sz) == False: 
-				dataset = self.series.at_z(sz)
-				if dataset is None:
-					return # out of Z bounds
-				pixarr  = dataset.pixel_array
-
-			# copy pixel
-			line_array[i] = pixarr[y,x]
+	def to_mm_many(self, coords):
+		"""
+		Same as **to_mm**, converts many local pixel coordinates to world coordinates 
+		in millimeter units at once
+		
+		Args:
+			coords (numpy.array): (N,2) array of X and Y pixel coordinates
+		
+		Returns:
+			numpy.array: (N,3) array of world coordinates
+		"""
+		return self.transform.to_world_many(coords)
 
-		return 
+	def to_pixel_many(self, coords):
+		"""
+		Same as **to_pixel**, converts many points from world coordinates in millimeter 
+		units to local coordinates, in pixels, at once
+		
+		Args:
+			coords (numpy.array, PointArray): (N,3) array of world coordinates
+		
+		Returns:
+			numpy.array: (N,2) integer array of local coordinates
+		"""
+		return self.transform.to_local_many(coords).astype(int)
 
-	def image(self, size):
+	def image(self, size, interpolation="nearest", threads=None, dtype=None, rescale=False):
 		"""
 		Constructs the image corresponding to this section and return an numpy array,
 		describing the image
 		
 		Args:
 			size (tuple): tuple of float or integer width,height values (see notes)
+			interpolation (str, optional): sampling mode, "nearest", "trilinear" or "cubic".
+				Defaults to "nearest".
+			threads (int, optional): number of threads rendering blocks of lines of the
+				image, useful for large sections. Defaults to 1.
+			dtype (numpy.dtype, optional): image type, defaults to the type of the series
+				pixel data, or **float32** when rescaling
+			rescale (bool, optional): converts samples to output units (e.g. Hounsfield units) 
+				with the *RescaleSlope* and *RescaleIntercept* of the series while sampling,
+				see **Series.rescale**. Defaults to **False**.
 		
 		Raises:
 			ValueError: when input of unknown type is received
@@ -266,10 +265,202 @@ class Section():
 			width and height in pixels of the resulting image. 
 			If it's a tuple of floats, then it will be considered to be the width and height
 			in millimeters for each for the area covered by the resulting image. 
+
+			The "trilinear" and "cubic" modes interpolate between neighbouring voxels, 
+			which avoids the blocky look of thick-slice series without supersampling.
 		
 		Returns:
 			numpy.array: numpy array of the constructed image
+
+		Examples:
+			>>> image = section.image((512,512), interpolation="trilinear")
+			>>> image = section.image((2048,2048), threads=4)
+			>>> hu    = section.image((512,512), rescale=True)
+		"""
+
+		shape     = self._image_shape(size)
+		geometry, volume, rescaling = self.series.sampling(self.pixel_spacing, rescale)
+		dtype     = image_dtype(volume, dtype, rescaling)
+		cache     = self.series.render_cache
+
+		# reuse the image of an identical section requested before
+		if cache is not None:
+			key    = cache.key(self.transform, shape, interpolation, dtype, rescale)
+			cached = cache.get(key)
+			if cached is not None:
+				return cached.copy()
+
+		# sample the whole section at once from the cached volume
+		image = render_section(
+			self.transform,
+			geometry,
+			volume,
+			shape,
+			dtype=dtype,
+			interpolation=interpolation,
+			threads=threads,
+			rescale=rescaling)
+
+		if cache is not None:
+			cache.put(key, image.copy())
+
+		return image
+
+	def slab(self, size, thickness, samples=None, mode="max", interpolation="nearest",
+			 dtype=None, rescale=False):
 		"""
+		Constructs the image of a thick slab centered on this section, reducing the 
+		volume along the section's normal with a maximum, minimum or mean projection
+
+		Args:
+			size (tuple): tuple of float or integer width,height values, same as for **image**
+			thickness (float): slab thickness in millimeters
+			samples (int, optional): number of samples across the slab, by default one 
+				for each voxel spacing along the thickness
+			mode (str, optional): "max" (MIP), "min" (MinIP) or "mean". Defaults to "max".
+			interpolation (str, optional): sampling mode, "nearest", "trilinear" or "cubic".
+				Defaults to "nearest".
+			dtype (numpy.dtype, optional): image type, same as for **image**
+			rescale (bool, optional): converts samples to output units, same as for **image**
+
+		Raises:
+			ValueError: when an unknown mode is given
+
+		Returns:
+			numpy.array: numpy array of the constructed image
+
+		Examples:
+			>>> # 10 mm maximum intensity projection
+			>>> mip = section.slab((512,512), 10.0, mode="max")
+		"""
+		geometry, volume, rescaling = self.series.sampling(self.pixel_spacing, rescale)
+
+		return render_slab(
+			self.transform,
+			geometry,
+			volume,
+			self._image_shape(size),
+			thickness,
+			samples=samples,
+			mode=mode,
+			dtype=dtype,
+			interpolation=interpolation,
+			rescale=rescaling)
+
+	def frame(self, index, step=None, axis=None, angle=0.0):
+		"""
+		Constructs the section reached after **index** steps of a sweep, see **sweep**
+
+		Args:
+			index (int): number of steps
+			step (Vector, tuple, optional): translation of the origin for each step, in millimeters
+			axis (str, Vector, optional): axis ("x", "y" or "z") or vector to rotate the section 
+				about, through its origin
+			angle (float, optional): rotation for each step, measured in radians
+
+		Returns:
+			Section: the swept section
+		"""
+		transform = self.transform
+		if axis is not None and angle != 0:
+			transform = transform.rotate(axis, index * angle)
+
+		if step is not None:
+			dx, dy, dz = step
+			transform = transform.copy()
+			transform.origin = Point(
+				transform.origin.x + index * dx,
+				transform.origin.y + index * dy,
+				transform.origin.z + index * dz)
+			transform.update()
+
+		return Section(self.series, transform)
+
+	def sweep(self, size, count, step=None, axis=None, angle=0.0, interpolation="nearest",
+			  threads=None, dtype=None, rescale=False):
+		"""
+		Lazily renders the images of a sequence of sections, starting from this one and
+		translating and/or rotating it by the same amount at each step
+
+		Args:
+			size (tuple): tuple of float or integer width,height values, same as for **image**
+			count (int): number of images
+			step (Vector, tuple, optional): translation of the origin for each step, in millimeters
+			axis (str, Vector, optional): axis ("x", "y" or "z") or vector to rotate the section 
+				about, through its origin
+			angle (float, optional): rotation for each step, measured in radians
+			interpolation (str, optional): sampling mode, same as for **image**
+			threads (int, optional): number of threads rendering blocks of lines, same as for **image**
+			dtype (numpy.dtype, optional): image type, same as for **image**
+			rescale (bool, optional): converts samples to output units, same as for **image**
+
+		Note:
+			The image size, volume, geometry and rescaling are resolved once for the whole
+			sweep, see **dicom3d.render.render_sweep**, and each image is the same as the
+			one of the matching **frame**. Each image is rendered only when requested, so
+			memory does not grow with the number of images.
+
+		Yields:
+			numpy.array: the image of each section, in order
+
+		Examples:
+			>>> # scroll through 100 sections, 1 mm apart
+			>>> for image in section.sweep((512,512), 100, step=(0,0,1)):
+			>>>		writer.append_data(image)
+			>>> # turn around the Z axis, 2 degrees at a time
+			>>> images = section.sweep((512,512), 180, axis="z", angle=radians(2))
+		"""
+		# checked now, images being rendered only when requested
+		check_interpolation(interpolation)
+
+		shape = self._image_shape(size)
+		geometry, volume, rescaling = self.series.sampling(self.pixel_spacing, rescale)
+
+		return render_sweep(
+			self._sweep_matrices(count, step, axis, angle),
+			geometry,
+			volume,
+			shape,
+			dtype=dtype,
+			interpolation=interpolation,
+			threads=threads,
+			rescale=rescaling)
+
+	def _sweep_matrices(self, count, step, axis, angle):
+		""" transformation matrices of the sections of a sweep, see **frame** """
+		matrices = np.zeros((count, 4, 4))
+		for index in range(0, count):
+			matrices[index] = self.frame(index, step, axis, angle).transform.matrix
+
+		return matrices
+
+	def plan(self, size, interpolation="nearest"):
+		"""
+		Precomputes the voxels and weights sampled to render the image of this section,
+		so that the image can be rendered again, for this or any other series with the
+		same volume layout, without repeating the geometry calculations
+
+		Args:
+			size (tuple): tuple of float or integer width,height values, same as for **image**
+			interpolation (str, optional): sampling mode, "nearest", "trilinear" or "cubic".
+				Defaults to "nearest".
+
+		Returns:
+			SamplingPlan: a **dicom3d.render.SamplingPlan** object
+
+		Examples:
+			>>> plan = section.plan((512,512))
+			>>> plan.save("sagittal.npz")
+			>>> image = SamplingPlan.load("sagittal.npz").apply(series)[0]
+		"""
+		return SamplingPlan.build(
+			[ self.transform ],
+			self.series.volume_geometry(),
+			self._image_shape(size),
+			interpolation)
+
+	def _image_shape(self, size):
+		""" converts an image size in pixels or millimeters to (lines, width) pixels """
 
 		width, height = size
 
@@ -298,14 +489,108 @@ class Section():
 			raise ValueError(
 				"Unknown section image size type (%s) need tuple of floats or integers" % (type(size)))
 
-		# move the (0,0) origin to top-left
-		offset = (-max_width//2, -max_lines//2)
+		return (max_lines, max_width)
+
+	@staticmethod
+	def _from_planes(series, planes, origins, orientation):
+		""" sections of a batch, see **batch** """
+		if len(planes) != len(origins):
+			raise ValueError("got %d planes and %d origins, expected the same number" % (
+				len(planes), len(origins)))
+
+		return [ Section.from_plane(series, plane, origin, orientation)
+					for plane, origin in zip(planes, origins) ]
 
-		# preallocate
-		image = np.zeros((max_lines, max_width), dtype=np.long)
+	@staticmethod
+	def _common_shape(sections, size):
+		""" image shape shared by the sections of a batch, (0,0) for no sections """
+		shapes = { section._image_shape(size) for section in sections }
+		if len(shapes) > 1:
+			raise ValueError("sections have different image sizes (%s)" % (
+				", ".join("%dx%d" % shape for shape in sorted(shapes))))
 
-		# populate
-		for line in range(0,max_lines):
-			self._line(image, line, offset, max_width)
+		return shapes.pop() if shapes else (0, 0)
 
-		return image
\ No newline at end of file
+	@staticmethod
+	def batch(series, planes, origins, size, interpolation="nearest", 
+			  memory_budget=MEMORY_BUDGET, orientation=True, threads=None,
+			  dtype=None, rescale=False):
+		"""
+		Constructs the sections defined by pairs of planes and origins and renders
+		all their images in a single call
+
+		Args:
+			series (Series): a **dicom3d.Series** object
+			planes (list): **dicom3d.Plane** objects of the sections
+			origins (list, numpy.array): center point of each section, as **Point** objects,
+				tuples or a (N,3) array of world coordinates
+			size (tuple): tuple of float or integer width,height values, same as for **image**
+			interpolation (str, optional): sampling mode, "nearest", "trilinear" or "cubic".
+				Defaults to "nearest".
+			memory_budget (int, optional): bytes available for intermediate arrays 
+			orientation (bool, optional): Fixes orientation. Defaults to True.
+			threads (int, optional): number of threads rendering blocks of lines. Defaults to 1.
+			dtype (numpy.dtype, optional): image type, same as for **image**
+			rescale (bool, optional): converts samples to output units, same as for **image**
+
+		Raises:
+			ValueError: when planes and origins differ in number, or the sections 
+				would have different image sizes
+			Exception: on intersection errors
+
+		Note:
+			The sample grids of all sections are built together and gathered from 
+			the cached volume in chunks, instead of paying the setup cost of 
+			**image** once per section.
+
+		Returns:
+			numpy.array: (sections, lines, width) stacked images of the sections
+
+		Examples:
+			>>> origins = [ origin.move("z", dz) for dz in range(0, 20) ]
+			>>> planes  = [ plane.move(o) for o in origins ]
+			>>> images  = Section.batch(series, planes, origins, (256,256))
+			>>> images.shape
+			(20, 256, 256)
+		"""
+		sections  = Section._from_planes(series, planes, origins, orientation)
+		shape     = Section._common_shape(sections, size)
+		spacing   = min((section.pixel_spacing for section in sections), key=min, default=None)
+		geometry, volume, rescaling = series.sampling(spacing, rescale)
+		dtype     = image_dtype(volume, dtype, rescaling)
+		images    = np.zeros((len(sections), *shape), dtype=dtype)
+		cache     = series.render_cache
+
+		# only render the sections missing from the render cache
+		missing = list(range(0, len(sections)))
+		if cache is not None:
+			keys = [ cache.key(section.transform, shape, interpolation, dtype, rescale)
+						for section in sections ]
+
+			missing = []
+			for idx, key in enumerate(keys):
+				cached = cache.get(key)
+				if cached is None:
+					missing.append(idx)
+				else:
+					images[idx] = cached
+
+		if len(missing) == 0:
+			return images
+
+		images[missing] = render_sections(
+			[ sections[idx].transform for idx in missing ],
+			geometry,
+			volume,
+			shape,
+			dtype=dtype,
+			interpolation=interpolation,
+			memory_budget=memory_budget,
+			threads=threads,
+			rescale=rescaling)
+
+		if cache is not None:
+			for idx in missing:
+				cache.put(keys[idx], images[idx].copy())
+
+		return images
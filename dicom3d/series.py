@@ -1,8 +1,123 @@
+import os
+import time
 import pydicom
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from .dataset import Dataset
-from .data import walk_data
+from .geometry import Point
+from .data import scan_data
+from .render import VolumeGeometry, MEMORY_BUDGET, _fit, slice_normal
+from .cache import LRUCache, VolumeStore
+from .index import HeaderIndex, INDEX_FILENAME
+
+SLICE_CACHE_BYTES = 256 * 1024 * 1024
+"""
+Default size, in bytes, of the cache of slices decoded on demand by a series loaded lazily
+"""
+
+class SeriesGeometry():
+	"""
+		Position, orientation, pixel spacing, thickness and size of every dataset of a
+		series, held in numpy arrays so that a series is sorted and checked without
+		building the coordinate system of each dataset
+
+		Args:
+			positions (numpy.array): (n,3) array of *ImagePositionPatient* values
+			orientations (numpy.array): (n,6) array of *ImageOrientationPatient* values
+			spacings (numpy.array): (n,2) array of *PixelSpacing* values
+			thicknesses (numpy.array): (n,) array of *SliceThickness* values, NaN when missing
+			rows (numpy.array): (n,) array of *Rows* values
+			columns (numpy.array): (n,) array of *Columns* values
+
+		Examples:
+			>>> geometry = SeriesGeometry.from_datasets(datasets)
+			>>> geometry.depth()[:3]
+			array([-50. , -47.5, -45. ])
+	"""
+
+	def __init__(self, positions, orientations, spacings, thicknesses, rows, columns):
+		self.positions    = np.asarray(positions, dtype=float).reshape(-1, 3)
+		self.orientations = np.asarray(orientations, dtype=float).reshape(-1, 6)
+		self.spacings     = np.asarray(spacings, dtype=float).reshape(-1, 2)
+		self.thicknesses  = np.asarray(thicknesses, dtype=float)
+		self.rows         = np.asarray(rows, dtype=int)
+		self.columns      = np.asarray(columns, dtype=int)
+
+	@staticmethod
+	def from_datasets(datasets):
+		"""
+		Reads the geometry of a list of datasets
+
+		Args:
+			datasets (list): **pydicom.dataset.Dataset** or **dicom3d.Dataset** objects
+
+		Returns:
+			SeriesGeometry: geometry of the datasets, in the order given
+		"""
+		datasets = [ dataset.dataset if isinstance(dataset, Dataset) else dataset 
+						for dataset in datasets ]
+
+		return SeriesGeometry(
+			[ dataset.ImagePositionPatient    for dataset in datasets ],
+			[ dataset.ImageOrientationPatient for dataset in datasets ],
+			[ dataset.PixelSpacing            for dataset in datasets ],
+			[ _number(dataset.get("SliceThickness")) for dataset in datasets ],
+			[ dataset.get("Rows", 0)    for dataset in datasets ],
+			[ dataset.get("Columns", 0) for dataset in datasets ])
+
+	def __len__(self):
+		return len(self.positions)
+
+	def z(self):
+		"""
+		Returns:
+			numpy.array: Z location of each dataset, see **Dataset.ZLocation**
+		"""
+		return self.positions[:,2]
+
+	def normal(self):
+		"""
+		Returns:
+			numpy.array: direction the datasets are stacked along, normal to the first
+			one, see **dicom3d.render.slice_normal**
+		"""
+		return slice_normal(self.orientations[0,:3], self.orientations[0,3:])
+
+	def depth(self):
+		"""
+		Returns:
+			numpy.array: location of each dataset along the **normal**, its Z location
+			for axial datasets
+		"""
+		nx, ny, nz = self.normal()
+		if nx == 0 and ny == 0 and nz == 1:
+			return self.z()
+
+		return self.positions @ np.array([nx, ny, nz])
+
+	def order(self):
+		"""
+		Returns:
+			numpy.array: indices sorting the datasets along their normal, keeping the given 
+			order of datasets at the same location
+		"""
+		return np.argsort(self.depth(), kind="stable")
+
+	def take(self, indices):
+		"""
+		Args:
+			indices (numpy.array): indices of the datasets to keep, in order
+
+		Returns:
+			SeriesGeometry: geometry of the selected datasets
+		"""
+		return SeriesGeometry(
+			self.positions[indices], self.orientations[indices], self.spacings[indices],
+			self.thicknesses[indices], self.rows[indices], self.columns[indices])
+
+def _number(value):
+	return np.nan if value is None or value == "" else float(value)
 
 class Series():
 	"""
@@ -10,7 +125,9 @@ class Series():
 
 	Note:
 		When constructed, this class performs the following operations 
-			- sorts the given datasets by *ZLocation*
+			- reads the geometry of the datasets into a **SeriesGeometry**, kept as *series_geometry*
+			- sorts the given datasets along the direction they are stacked, that is by
+			  *ZLocation* for axial datasets (see **depth**)
 			- wraps the datasets in **dicom3d.Dataset** class
 			- checks the series for spacial homogeneity
 
@@ -19,6 +136,23 @@ class Series():
 		it makes over the volumetric scan, are correct. These assumptions are related
 		to space contiguity between datasets and consistent density and size among
 		datasets 
+
+	Note:
+		Section images can be cached by attaching a **dicom3d.cache.RenderCache**
+		object to the *render_cache* attribute of a series, and previews can be
+		sampled from downsampled volumes by attaching a **dicom3d.pyramid.VolumePyramid**
+		object to its *pyramid* attribute
+
+	Note:
+		Z locations used by **z_bounds**, **at_z** and **z_index** are measured along the
+		direction datasets are stacked, normal to their orientation, which is the world
+		Z axis for axial datasets. Sagittal, coronal, oblique and gantry tilted series
+		are mapped to the volume built by **cache** through the **affine** matrix
+
+	Note:
+		Series with irregular slice spacing can be loaded with the homogeneity check 
+		disabled. Their datasets are then found by Z location with **z_index**, and
+		sections are rendered from an evenly spaced volume built by **resample**
 		
 	Important: 
 		A series is homogeneous if:
@@ -35,15 +169,14 @@ class Series():
 
 	def __init__(self, datasets, check_homogeneity=True):
 
-		# wrao datasets in helper class
-		wrapped_datasets = self._wrap(datasets)
+		# sort datasets by Z location
+		geometry = SeriesGeometry.from_datasets(datasets)
+		order    = geometry.order()
 
-		# sort datasets by SliceLocation
-		self.datasets = sorted(wrapped_datasets, key=lambda ds: ds.ZLocation)
+		self.series_geometry = geometry.take(order)
 
-		# fix index
-		for idx, dataset in enumerate(self.datasets):
-			dataset.index = idx
+		# wrap datasets in helper class
+		self.datasets = self._wrap([ datasets[idx] for idx in order ])
 
 		# check for consistency in Z-location, thickness, density etc.
 		if check_homogeneity:
@@ -53,10 +186,17 @@ class Series():
 			self.homogeneous = False
 			self.mapping = None
 
-		self.pixel_data = None
+		self.pixel_data   = None
+		self.geometry     = None
+		self.resampled    = None
+		self.render_cache = None
+		self.pyramid      = None
+		self.slice_cache  = LRUCache(SLICE_CACHE_BYTES)
+		self.cache_report = None
 
 	@staticmethod
-	def from_directory(path, pattern="*.dcm", check_homogeneity=True):
+	def from_directory(path, pattern="*.dcm", check_homogeneity=True, cache_dir=None, lazy=False,
+					   workers=None, dicom=False, index=None):
 		"""
 		Constructs a series from a directory of DICOM files
 		
@@ -64,28 +204,106 @@ class Series():
 			path (str): path to the directory continaing the DICOM files
 			pattern (str, optional): Wildcard pattern of DIICOM files, default is "\*.dcm"
 			check_homogeneity (bool, optional): Homogeneity test, default is **True**
+			cache_dir (str, optional): directory of a **dicom3d.cache.VolumeStore** keeping 
+				the volume of the series between runs, default is **None**
+			lazy (bool, optional): only read the headers of the files, pixel data being 
+				read when accessed, default is **False**
+			workers (int, optional): number of threads reading files concurrently, useful 
+				on network filesystems, default is 1
+			dicom (bool, optional): only read DICOM files, detected by their contents 
+				(use with a "\*" pattern for files without extension), default is **False**
+			index (bool, optional): keep a **dicom3d.index.HeaderIndex** of the files, in
+				*cache_dir* if given or else in the series directory, default is **None**,
+				using the index only if one was already written, **False** never using it
+
+		Note:
+			With a *cache_dir*, the volume built by **cache** is stored the first time
+			the series is loaded. Later loads only read the headers of the files and 
+			map the stored volume, until any file of the series changes and the volume 
+			is stored again, replacing the stale one.
+
+			With an *index*, files that did not change since they were indexed are not
+			parsed again, their datasets being built from the index without pixel data.
+			Once written with *index* set to **True**, the index is used by later loads
+			by default, so that loads from a stored volume do not parse every header.
+
+			Datasets read without pixel data, lazily, from a stored volume or an index, 
+			decode their pixels on demand and keep them in the *slice_cache* of the series,
+			a **dicom3d.cache.LRUCache** bounded to **SLICE_CACHE_BYTES** by default.
 		
 		Returns:
 			[Series]: a **dicom3d.Series** object
 		"""
 
 		# enumerate all files with this pattern
-		files = walk_data(
+		files = list(scan_data(
 			path, pattern, 
-			search_files=True, search_dirs=False)
+			search_files=True, search_dirs=False, dicom=dicom))
 
-		# read the datasets
-		datasets = [ pydicom.dcmread(image_filename)
-							 	 for image_filename in files ]
-					
-		if len(datasets) == 0:
+		# leave out header indexes, and their temporary copies, written in the directory
+		files = [ filename for filename in files 
+					if not os.path.basename(filename).startswith(INDEX_FILENAME) ]
+
+		if len(files) == 0:
 			raise Exception("no datasets found to build series from directory '%s'" % (
 				path ))
 
-		# construct the series
-		return Series(
-			datasets,
-			check_homogeneity = check_homogeneity)
+		headers = None
+		if index is not False:
+			headers = HeaderIndex.open(path, cache_dir)
+			# by default, only an index written by an earlier load is kept up to date
+			if index is None and not os.path.exists(headers.path):
+				headers = None
+
+		def read(headers_only):
+			if headers is None:
+				return Series._read(files, headers_only, workers)
+
+			datasets = headers.read(files, workers)
+			headers.save()
+			return datasets
+
+		if cache_dir is None or not check_homogeneity:
+			# read the datasets
+			datasets = read(lazy)
+
+			# construct the series
+			return Series(
+				datasets,
+				check_homogeneity = check_homogeneity)
+
+		store = VolumeStore(cache_dir)
+		uid   = pydicom.dcmread(files[0], stop_before_pixels=True).SeriesInstanceUID
+		key   = store.key(files, uid)
+
+		# stored volume => headers are enough
+		series = None
+		if key in store:
+			series = Series(read(True))
+
+			series.pixel_data = store.load(key, series.volume_geometry())
+			if series.pixel_data is None:
+				series = None
+
+		if series is None:
+			series = Series(read(lazy))
+
+			store.save(key, series.cache(workers), series.volume_geometry(), uid, path)
+
+		return series
+
+	@staticmethod
+	def _read(files, headers_only=False, workers=None):
+		""" reads DICOM files, in the order given, on a pool of threads if more than one worker """
+		def read(filename):
+			return pydicom.dcmread(filename, stop_before_pixels=headers_only)
+
+		workers = max(1, workers or 1)
+		if workers == 1 or len(files) < 2:
+			return [ read(filename) for filename in files ]
+
+		with ThreadPoolExecutor(max_workers=workers) as executor:
+			return list(executor.map(read, files))
 
 	@staticmethod
 	def from_dataset(dataset):
@@ -140,29 +358,32 @@ class Series():
 		return datasets
 
 	def _wrap(self, datasets):
-		""" wrap each dataset into the 'dataset' class """
+		""" wrap each dataset into the 'dataset' class, with its Z location """
 
 		if len(datasets) == 0:
 			return []
 
+		z = self.series_geometry.z()
+
 		# already wraped, re-wrap
 		if type(datasets[0]) is Dataset:
-			return [ Dataset(x.dataset, self, idx) 
+			return [ Dataset(x.dataset, self, idx, z[idx]) 
 					for idx,x in enumerate(datasets) ]
 
-		return [ Dataset(x, self, idx) 
+		return [ Dataset(x, self, idx, z[idx]) 
 					for idx,x in enumerate(datasets) ]
 
 	def _build_mapping(self):
+		z = self.series_geometry.depth()
 
-		# avoid using SliceThickness
-		if len(self.datasets) > 1:
-			thick = self.datasets[1].ZLocation - self.datasets[0].ZLocation
+		# avoid using SliceThickness, the mean spacing being exact for evenly spaced slices
+		if len(z) > 1:
+			thick = (z[-1] - z[0]) / (len(z) - 1)
 		else:
 			thick = self.datasets[0].SliceThickness
 
-		start_z = self.first().ZLocation
-		end_z   = self.last().ZLocation + thick
+		start_z = z[0]
+		end_z   = z[-1] + thick
 
 		self.mapping = (start_z, end_z, thick)
 		return True
@@ -183,56 +404,77 @@ class Series():
 			self.homogeneous = True
 			return
 
-		# check continuity
-		prev = self.first()
+		geometry = self.series_geometry
+		z = geometry.depth()
 
-		ref_thickness = prev.SliceThickness
-		ref_distance  = prev.next().ZLocation - prev.ZLocation
-		ref_Rows      = prev.Rows
-		ref_Columns   = prev.Columns 
-		ref_imop	  = prev.ImageOrientationPatient
-		ref_density   = prev.PixelSpacing
+		# missing thicknesses are NaN, equal to each other here
+		thicknesses = geometry.thicknesses
+		missing     = np.isnan(thicknesses)
 
+		# check continuity
+		ref_distance = z[1] - z[0]
 		if ref_distance == 0:
 			raise Exception("homogeneity test failed: first datasets have the same Z location")
-		
-		for dataset in self.datasets[1:]:
 
+		# failed checks of each dataset after the first, in the order they are reported
+		checks = [
 			# check if a datasets ends where the other one begins
-			diff = dataset.ZLocation - prev.ZLocation - ref_distance
-			if abs(diff) > tolerance:
-				raise Exception("homogeneity test failed: series is not continuous on the Z axis")
+			(np.abs(np.diff(z) - ref_distance) > tolerance,
+				"series is not continuous on the Z axis"),
 
 			# check if a dataset has different slice thickness
-			if dataset.SliceThickness != ref_thickness:
-				raise Exception("homogeneity test failed: series has datasets with variable thickness")
+			(~((thicknesses[1:] == thicknesses[0]) | (missing[1:] & missing[0])),
+				"series has datasets with variable thickness"),
 
 			# check for same rows and columns
-			if dataset.Rows != ref_Rows or dataset.Columns != ref_Columns:
-				raise Exception("homogeneity test failed: series has datasets with variable Rows,Columns configuration")
+			((geometry.rows[1:] != geometry.rows[0]) | (geometry.columns[1:] != geometry.columns[0]),
+				"series has datasets with variable Rows,Columns configuration"),
 
 			# datasets must have same coordinate system
-			if dataset.ImageOrientationPatient != ref_imop:
-				raise Exception("homogeneity test failed: series has datasets with different orientation (ImageOrientationPatient)") 
+			(np.any(geometry.orientations[1:] != geometry.orientations[0], axis=1),
+				"series has datasets with different orientation (ImageOrientationPatient)"),
 
 			# datasets must have same density
-			if dataset.PixelSpacing != ref_density:
-				raise Exception("homogeneity test failed: series has datasets with different density (PixelSpacing)")
+			(np.any(geometry.spacings[1:] != geometry.spacings[0], axis=1),
+				"series has datasets with different density (PixelSpacing)")
+		]
 
-			prev = dataset
+		failed = np.array([ check for check, _ in checks ])
+		if failed.any():
+			# first failing dataset, then its first failed check
+			dataset = np.argmax(failed.any(axis=0))
+			_, message = checks[np.argmax(failed[:,dataset])]
+			raise Exception("homogeneity test failed: " + message)
 
 		self.homogeneous = True
 		return
 
-	def cache(self):
+	def cache(self, workers=None, progress=None):
 		"""
 		Builds a three-dimensional numpy array from all pixel data from datasets. 
 		
-		Important:
-			Reserved for future use!
+		Args:
+			workers (int, optional): number of threads decoding slices, useful for
+				compressed transfer syntaxes. Defaults to 1.
+			progress (callable, optional): function called as *progress(done, total)*
+				after each decoded slice, from the calling thread
+
+		Note:
+			The volume is built once and reused by **dicom3d.Section** to render
+			section images. It keeps the stored type of the pixel data (e.g. **int16**
+			for most CT scans), use **rescale** to convert values to output units.
+
+			Each slice is decoded straight into its place in the volume. The time spent
+			decoding and copying slices, summed over all threads, and the elapsed time
+			are kept in the *cache_report* dictionary of the series.
 
 		Returns:
 			numpy.array: numpy array of the pixel data
+
+		Examples:
+			>>> volume = series.cache(workers=8, progress=lambda done, total: print(done, "/", total))
+			>>> series.cache_report
+			{'slices': 120, 'workers': 8, 'decode': 1.92, 'copy': 0.03, 'elapsed': 0.31}
 		"""
 
 		if self.pixel_data is not None:
@@ -240,17 +482,302 @@ class Series():
 
 		self._ensure_homogeneity()
 
-		dataset    = self.first()
-		zd, yd, xd = len(self.datasets), dataset.Rows, dataset.Columns
-		pixel_data = np.zeros((zd, yd, xd),dtype=np.long)
+		self.pixel_data = self._decode(workers, progress)
+		return self.pixel_data
+
+	def _decode(self, workers=None, progress=None):
+		""" decodes the slices of all datasets, in order, into a volume """
+		start   = time.perf_counter()
+		count   = len(self.datasets)
+		workers = max(1, workers or 1)
+		report  = { "slices": count, "workers": workers, "decode": 0.0, "copy": 0.0 }
+		widen   = {}
+
+		# the first slice sets the type of the volume
+		first      = self.first()
+		pixels     = first.read_pixels()
+		pixel_data = np.empty((count, first.Rows, first.Columns), dtype=pixels.dtype)
+		report["decode"] += time.perf_counter() - start
+
+		def load(zi):
+			""" decodes a slice into the volume, or returns it if the volume can't hold its type """
+			begin   = time.perf_counter()
+			pixels  = self.datasets[zi].read_pixels()
+			decoded = time.perf_counter()
+
+			if not np.can_cast(pixels.dtype, pixel_data.dtype):
+				return pixels, decoded - begin, 0.0
+
+			pixel_data[zi,:,:] = pixels
+			return None, decoded - begin, time.perf_counter() - decoded
+
+		def loaded(zi, result, done):
+			slice_pixels, decode, copy = result
+			report["decode"] += decode
+			report["copy"]   += copy
+			if slice_pixels is not None:
+				widen[zi] = slice_pixels
+			if progress is not None:
+				progress(done, count)
+
+		begin = time.perf_counter()
+		pixel_data[0,:,:] = pixels
+		loaded(0, (None, 0.0, time.perf_counter() - begin), 1)
+
+		if workers == 1:
+			for zi in range(1, count):
+				loaded(zi, load(zi), zi + 1)
+		else:
+			with ThreadPoolExecutor(max_workers=workers) as executor:
+				futures = { executor.submit(load, zi): zi for zi in range(1, count) }
+				for done, future in enumerate(as_completed(futures), 2):
+					loaded(futures[future], future.result(), done)
 
-		# populate
-		for zi, dataset in enumerate(self.datasets):
-			pixel_data[zi,:,:] = dataset.pixel_array
+		# datasets stored with different types, widen the volume
+		if len(widen) > 0:
+			pixel_data = pixel_data.astype(np.result_type(pixel_data, *widen.values()))
+			for zi, slice_pixels in widen.items():
+				pixel_data[zi,:,:] = slice_pixels
 
-		self.pixel_data = pixel_data
+		report["elapsed"] = time.perf_counter() - start
+
+		self.cache_report = report
 		return pixel_data
 
+	def resample(self, spacing=None, workers=None, memory_budget=MEMORY_BUDGET):
+		"""
+		Resamples the datasets of a series with irregular slice spacing into a volume of
+		evenly spaced slices, interpolating linearly between the two closest datasets
+
+		Args:
+			spacing (float, optional): distance between slices in millimeters, defaults
+				to the smallest distance between datasets
+			workers (int, optional): number of threads decoding slices, see **cache**
+			memory_budget (int, optional): bytes available for intermediate arrays
+
+		Raises:
+			ValueError: when the datasets differ in size, orientation or pixel spacing,
+				or the series has less than two Z locations
+
+		Note:
+			Datasets sharing a Z location are resampled from the first one. The volume
+			keeps the stored type of the pixel data, unless datasets are rescaled 
+			differently (see **rescale**): stored values then can't be interpolated, and 
+			the volume holds **float32** values in output units instead. It is kept in the
+			*resampled* attribute and used by **sampling** to render sections of non 
+			homogeneous series.
+
+		Returns:
+			tuple: (geometry, volume) pair of **VolumeGeometry** and numpy array
+
+		Examples:
+			>>> series = Series(datasets, check_homogeneity=False)
+			>>> geometry, volume = series.resample(spacing=1.0)
+			>>> geometry.mapping
+			(-50.0, 71.0, 1.0)
+		"""
+		geometry = self.series_geometry
+		for values, name in ((geometry.rows, "Rows"), (geometry.columns, "Columns"),
+							 (geometry.orientations, "ImageOrientationPatient"),
+							 (geometry.spacings, "PixelSpacing")):
+			if np.any(values != values[0]):
+				raise ValueError("can't resample series with datasets of different %s" % (name))
+
+		# distinct Z locations
+		z    = geometry.depth()
+		keep = np.flatnonzero(np.concatenate(([True], np.diff(z) > 0)))
+		if len(keep) < 2:
+			raise ValueError("can't resample series with less than two Z locations")
+
+		z = z[keep]
+		if spacing is None:
+			spacing = float(np.min(np.diff(z)))
+
+		count = int(np.floor((z[-1] - z[0]) / spacing + 1.e-6)) + 1
+		slice_z = z[0] + np.arange(0, count) * spacing
+
+		# closest datasets below and above each slice
+		lower  = np.clip(np.searchsorted(z, slice_z, side="right") - 1, 0, len(z) - 2)
+		weight = np.clip((slice_z - z[lower]) / (z[lower + 1] - z[lower]), 0, 1)
+
+		positions = geometry.positions[keep]
+		origins = positions[lower] + weight[:,None] * (positions[lower + 1] - positions[lower])
+
+		source = self.pixel_data if self.pixel_data is not None else self._decode(workers)
+		source = source[keep]
+
+		# values of datasets rescaled differently are interpolated in output units
+		rescaled = not self._uniform_rescale()
+		slopes, intercepts = self.rescale()
+		slopes, intercepts = slopes[keep,None,None], intercepts[keep,None,None]
+
+		_, rows, columns = source.shape
+		volume = np.empty((count, rows, columns), dtype=np.float32 if rescaled else source.dtype)
+		block  = max(1, memory_budget // (rows * columns * 8 * 2))
+
+		for start in range(0, count, block):
+			part = slice(start, start + block)
+			below, above = source[lower[part]], source[lower[part] + 1]
+			if rescaled:
+				below = below * slopes[lower[part]] + intercepts[lower[part]]
+				above = above * slopes[lower[part] + 1] + intercepts[lower[part] + 1]
+			volume[part] = _fit(below + weight[part,None,None] * (above.astype(float) - below), volume.dtype)
+
+		first = self.first()
+		self.resampled = (
+			VolumeGeometry(
+				origins,
+				first.transform.x_vector.tuple(),
+				first.transform.y_vector.tuple(),
+				first.transform.scaling,
+				(z[0], z[0] + count * spacing, spacing),
+				volume.shape),
+			volume)
+
+		return self.resampled
+
+	def rescale(self):
+		"""
+		Returns the linear transformation of stored pixel values to output units,
+		such as Hounsfield units for CT, defined by the *RescaleSlope* and 
+		*RescaleIntercept* attributes of each dataset
+
+		Note:
+			Datasets missing these attributes are not rescaled (slope 1, intercept 0)
+
+		Returns:
+			tuple: (slopes, intercepts) arrays holding the values of each dataset
+
+		Examples:
+			>>> slopes, intercepts = series.rescale()
+			>>> hu = series.cache()[10] * slopes[10] + intercepts[10]
+		"""
+		slopes     = np.array([ float(getattr(dataset, "RescaleSlope", 1)) 
+								for dataset in self.datasets ])
+		intercepts = np.array([ float(getattr(dataset, "RescaleIntercept", 0)) 
+								for dataset in self.datasets ])
+
+		return slopes, intercepts
+
+	def _uniform_rescale(self):
+		""" whether all datasets share their rescaling, see **rescale** """
+		slopes, intercepts = self.rescale()
+		return np.all(slopes == slopes[0]) and np.all(intercepts == intercepts[0])
+
+	def sampling(self, pixel_spacing=None, rescale=False):
+		"""
+		Returns what to sample to render images with the given pixel spacing: the volume
+		built by **cache** or, when a pyramid is attached, the coarsest pyramid level 
+		that still matches the pixel spacing. Non homogeneous series are sampled from
+		the volume built by **resample**, already in output units when their datasets
+		are rescaled differently.
+
+		Args:
+			pixel_spacing (tuple, optional): X and Y pixel spacing of the images, in millimeters
+			rescale (bool, optional): whether samples are rescaled to output units
+
+		Returns:
+			tuple: (geometry, volume, rescaling) where *rescaling* holds the arrays returned
+			by **rescale**, or **None**
+		"""
+		if self.pyramid is not None and pixel_spacing is not None:
+			return self.pyramid.source(pixel_spacing, rescale)
+
+		if not self.homogeneous:
+			geometry, volume = self.resampled if self.resampled is not None else self.resample()
+
+			# each slice rescaled as the dataset it starts in
+			rescaling = None
+			if rescale and self._uniform_rescale():
+				slopes, intercepts = self.rescale()
+				index = self.z_index(self.depth(geometry.origins))
+				rescaling = (slopes[index], intercepts[index])
+
+			return geometry, volume, rescaling
+
+		return self.volume_geometry(), self.cache(), self.rescale() if rescale else None
+
+	def volume_geometry(self):
+		"""
+		Returns the world coordinates layout of the volume built by **Series.cache**,
+		used for vectorized sampling of the volume
+
+		Important:
+			If homogeneity test was disabled for this series, this function will raise
+			an exception
+
+		Returns:
+			VolumeGeometry: a **dicom3d.render.VolumeGeometry** object
+		"""
+		if self.geometry is not None:
+			return self.geometry
+
+		self.geometry = VolumeGeometry.from_series(self)
+		return self.geometry
+
+	def depth(self, points):
+		"""
+		Locates world coordinates along the direction datasets are stacked, the Z
+		location used by **at_z**, **z_index** and **z_bounds**
+
+		Args:
+			points (tuple, Point, numpy.array): a point or a (...,3) array of world coordinates
+
+		Returns:
+			float, numpy.array: location of the points along the datasets normal,
+			their Z coordinate for axial datasets
+		"""
+		nx, ny, nz = self.series_geometry.normal()
+		points = np.asarray(tuple(points) if isinstance(points, Point) else points, dtype=float)
+
+		depth = points[...,2] if nx == 0 and ny == 0 and nz == 1 else \
+				points[...,0] * nx + points[...,1] * ny + points[...,2] * nz
+
+		return float(depth) if depth.ndim == 0 else depth
+
+	def affine(self, inverse=False):
+		"""
+		Returns the matrix mapping voxel coordinates of the volume built by **cache**
+		to world coordinates, built from the *ImageOrientationPatient* and
+		*ImagePositionPatient* of the datasets and the offset between them
+
+		Args:
+			inverse (bool, optional): returns the world to voxel matrix instead
+
+		Returns:
+			numpy.array: 4x4 matrix, applying to (slice, row, column, 1) voxel coordinates
+
+		Examples:
+			>>> matrix = series.affine()
+			>>> x, y, z, _ = matrix @ (10, 20, 30, 1)  # world coordinates of volume[10,20,30]
+		"""
+		geometry = self.volume_geometry()
+		return geometry.inverse if inverse else geometry.affine
+
+	def world_to_voxel(self, points):
+		"""
+		Maps world coordinates to continuous voxel coordinates of the volume built by
+		**cache**, the voxel **volume[k,j,i]** covering the [k,k+1) x [j,j+1) x [i,i+1) range
+
+		Args:
+			points (numpy.array): (...,3) array of world coordinates
+
+		Returns:
+			numpy.array: (...,3) array of (slice, row, column) voxel coordinates
+		"""
+		return self.volume_geometry().world_to_voxel(points)
+
+	def voxel_to_world(self, voxels):
+		"""
+		Maps continuous voxel coordinates of the volume built by **cache** to world coordinates
+
+		Args:
+			voxels (numpy.array): (...,3) array of (slice, row, column) voxel coordinates
+
+		Returns:
+			numpy.array: (...,3) array of world coordinates
+		"""
+		return self.volume_geometry().voxel_to_world(voxels)
 
 	def first(self):
 		"""
@@ -292,7 +819,7 @@ class Series():
 
 	def z_bounds(self):
 		"""
-		Returns a tuple representing the world Z coordinates of the volumetric scan, 
+		Returns a tuple representing the Z locations bounding the volumetric scan, 
 		including the top dataset and its thickness.
 
 		Important:
@@ -309,8 +836,9 @@ class Series():
 		
 		self._ensure_homogeneity()
 
-		start_z, end_z, _ = self.mapping
-		return (start_z, end_z)
+		z = self.series_geometry.depth()
+		_, _, thick = self.mapping
+		return (z[0], z[-1] + thick)
 
 	def at_index(self, index):
 		"""
@@ -329,11 +857,11 @@ class Series():
 
 	def at_z(self, z_loc):
 		"""
-		Returns the dataset that intersects the given Z location in world coordinates
+		Returns the dataset that intersects the given Z location, see **depth**
 		
-		Important:
-			If homogeneity test was disabled for this series, this function will raise
-			an exception
+		Note:
+			If homogeneity test was disabled for this series, the dataset is found
+			with **z_index**
 
 		Args:
 			z_loc (float): value describing location on the Z axis
@@ -341,14 +869,17 @@ class Series():
 		Returns:
 			Dataset: the corresponding **dicom3d.Dataset** object 
 		"""
-		self._ensure_homogeneity()
+		if not self.homogeneous:
+			idx = self.z_index(z_loc)
+			return self.datasets[idx] if idx >= 0 else None
 
-		# linear mapping -> calculate index
+		# linear mapping -> calculate index, tolerating rounding errors of dataset locations
 		start_z, end_z, thick = self.mapping
-		if z_loc >= end_z or z_loc < start_z: 
+		position = (z_loc - start_z) / thick + 1.e-6
+		if z_loc >= end_z or position < 0: 
 			return None # exceeds Z segment
 
-		idx = int((z_loc - start_z) / thick)
+		idx = min(int(position), len(self.datasets) - 1)
 		return self.datasets[idx]
 
 	def at(self, where):
@@ -358,15 +889,16 @@ class Series():
 
 		Args:
 			where (int, float, tuple, Point): if **where** is an integer is treated like an index,
-				else is considered to be a Z location
+				a float is considered to be a Z location (see **depth**) and a point is
+				located in world coordinates
 
 		Returns:
 			Dataset: the corresponding **dicom3d.Dataset** object 
 
 		Examples:
-			 >>> dataset = series.at(1.0) # gets dataset at 0.1 Z coordinate
+			 >>> dataset = series.at(1.0) # gets dataset at 1.0 Z location
 			 >>> dataset = series.at(1)   # gets dataset at index 1
-			 >>> dataset = series.at(Point(5,5,2)) # gets dataset at 2.0 Z coordinate
+			 >>> dataset = series.at(Point(5,5,2)) # gets dataset containing the point
 		"""
 
 		if type(where) is int:
@@ -375,17 +907,54 @@ class Series():
 			return self.at_z(where)
 		if type(where) is tuple and len(where) == 3 or type(where) is Point:
 			x,y,z = where
-			dataset = self.at_z(z)
+			dataset = self.at_z(self.depth(where))
 			if dataset is None: return None
-			return dataset if dataset.intersects_xy((x,y)) else None
+
+			# axial datasets span X,Y world coordinates, others are checked in their plane
+			nx, ny, nz = self.series_geometry.normal()
+			if nx == 0 and ny == 0 and nz == 1:
+				return dataset if dataset.intersects_xy((x,y)) else None
+
+			column, row = dataset.transform.to_local(where)
+			inside = column >= 0 and column <= dataset.Columns - 1 and \
+					 row >= 0 and row <= dataset.Rows - 1
+			return dataset if inside else None
 
 		raise ValueError("invalid type for looking up dataset (%s)" % (type(where)))
 
+	def z_index(self, z_loc):
+		"""
+		Finds the datasets containing Z locations by a binary search over the sorted Z
+		locations of the datasets. Each dataset spans up to the next one, the last one
+		spans its *SliceThickness*, or else the distance from the previous one.
+
+		Args:
+			z_loc (float, numpy.array): Z locations, see **depth**
+
+		Returns:
+			int, numpy.array: index of the first dataset at each location, -1 when outside
+			of the series
+		"""
+		z = self.series_geometry.depth()
+
+		last = self.series_geometry.thicknesses[-1]
+		if np.isnan(last):
+			last = z[-1] - z[-2] if len(z) > 1 else 0.0
+
+		z_loc = np.asarray(z_loc, dtype=float)
+		index = np.searchsorted(z, z_loc, side="right") - 1
+
+		# first of the datasets sharing a location
+		index = np.searchsorted(z, z[np.maximum(index, 0)], side="left")
+		index = np.where((z_loc < z[0]) | (z_loc >= z[-1] + last), -1, index)
+
+		return int(index) if index.ndim == 0 else index
+
 	def find_dataset(self, z_loc):
 		"""
 		Despite **Series.at_z** method, this one doesn't require homogenuity test to be ran
-		If will effectively search though the list to find the corresponding dataset, instead
-		of calculating the index based on Z-bounds and dataset thickness.
+		It finds the corresponding dataset with **z_index**, instead of calculating the
+		index based on Z-bounds and dataset thickness.
 		
 		Args:
 			z_loc (float):  value describing location on the Z axiss 
@@ -393,7 +962,4 @@ class Series():
 		Returns:
 			int: index of the corresponding dataset or -1 if not found
 		"""
-		for idx, dataset in enumerate(self.datasets):
-			if z_loc >= dataset.ZLocation and z_loc < dataset.ZLocation + dataset.SliceThickness:
-				return idx
-		return -1 
+		return self.z_index(z_loc) 
@@ -30,10 +30,10 @@ setuptools.setup(
         "Intended Audience :: Science/Research",
         "Development Status :: 5 - Production/Stable",
         "Programming Language :: Python",
-        "Programming Language :: Python :: 3.4",
-        "Programming Language :: Python :: 3.5",
-        "Programming Language :: Python :: 3.6",
-        "Programming Language :: Python :: 3.7",
+        "Programming Language :: Python :: 3.8",
+        "Programming Language :: Python :: 3.9",
+        "Programming Language :: Python :: 3.10",
+        "Programming Language :: Python :: 3.11",
         "Operating System :: OS Independent",
         "Topic :: Scientific/Engineering :: Medical Science Apps.",
         "Topic :: Scientific/Engineering :: Physics",
@@ -42,5 +42,5 @@ setuptools.setup(
     install_requires= [
         'pydicom', 'numpy'
     ],
-    python_requires='>=3.4',
+    python_requires='>=3.8',
 )
\ No newline at end of file
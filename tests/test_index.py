@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+import dicom3d as d3d
+from dicom3d.data import synthetic_datasets
+
+def write_series(directory, signed):
+	""" writes a 12 bit series whose unused high bits are set, returns the stored values """
+	datasets = synthetic_datasets(count=4, rows=16, columns=24)
+
+	values = []
+	for index, dataset in enumerate(datasets):
+		pixels = dataset.pixel_array.astype(np.int32) * 2
+		if signed:
+			pixels = np.clip(pixels, -2048, 2047)
+		else:
+			pixels = np.clip(pixels + 2048, 0, 4095)
+		values.append(pixels)
+
+		# 12 bit two's complement values, with bits 12 to 15 holding garbage
+		raw = (pixels & 0x0FFF) | 0xA000
+
+		dataset.BitsStored          = 12
+		dataset.HighBit             = 11
+		dataset.PixelRepresentation = 1 if signed else 0
+		dataset.PixelData = raw.astype(np.uint16).tobytes()
+		dataset.save_as(str(directory / ("%03d.dcm" % index)), write_like_original=False)
+
+	return np.array(values)
+
+@pytest.mark.parametrize("signed", [ False, True ])
+def test_index_reads_12_bit_pixels(tmp_path, signed):
+	values = write_series(tmp_path, signed)
+
+	# pixel data decoded by pydicom
+	series = d3d.Series.from_directory(str(tmp_path), index=True)
+	assert np.array_equal(series.cache(), values)
+
+	# pixel data read straight from the files, at the offsets kept in the index
+	series = d3d.Series.from_directory(str(tmp_path), index=True)
+	assert all(getattr(dataset, "pixel_location", None) is not None for dataset in series.datasets)
+	assert np.array_equal(series.cache(), values)
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+import dicom3d as d3d
+from dicom3d.data import synthetic_datasets
+
+def oblique_series(degrees, count=12, thickness=2.0):
+	""" series of datasets tilted about the X axis, stacked along their normal """
+	angle  = np.radians(degrees)
+	row    = np.array([ 1.0, 0.0, 0.0 ])
+	column = np.array([ 0.0, np.cos(angle), np.sin(angle) ])
+	normal = np.cross(row, column)
+
+	datasets = synthetic_datasets(count=count, rows=16, columns=16,
+		pixel_spacing=(1.0, 1.0), thickness=thickness)
+
+	for index, dataset in enumerate(datasets):
+		dataset.ImageOrientationPatient = [ *row, *column ]
+		dataset.ImagePositionPatient = list(np.array([ -8.0, -8.0, 3.0 ]) + index * thickness * normal)
+
+	return d3d.Series(datasets)
+
+@pytest.mark.parametrize("degrees", [ 10, 35, 40, 45, 60, 70 ])
+def test_oblique_stack_locates_slices(degrees):
+	series = oblique_series(degrees)
+	volume = series.cache()
+
+	for index in range(0, series.count()):
+		dataset = series.at_index(index)
+		assert series.at(dataset.center()) is dataset
+
+		# section in the plane of the dataset, sampling the center of its pixels
+		transform = dataset.transform.copy()
+		transform.origin = dataset.to_mm(8.5, 8.5)
+		transform.update()
+
+		image = d3d.Section(series, transform).image((16, 16))
+		assert np.array_equal(image, volume[index])